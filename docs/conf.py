@@ -2,9 +2,8 @@
 #
 # HyGCS documentation build configuration
 
-import os
-import sys
-sys.path.insert(0, os.path.abspath('../hygcs'))
+# The package is expected to be installed (pip install -e .) for autodoc;
+# no sys.path manipulation so hygcs is always imported under its real name.
 
 # -- Project information -----------------------------------------------------
 
@@ -66,9 +65,20 @@ autodoc_default_options = {
     'member-order': 'bysource',
     'special-members': '__init__',
     'undoc-members': False,
-    'exclude-members': '__weakref__'
+    'exclude-members': '__weakref__',
+    # Let __all__ from the lazy hygcs/__init__.py drive what is documented
+    'ignore-module-all': False,
 }
 
+# Mock only the optional intersection backend; the real runtime
+# dependencies are installed for the docs build (requirements-docs.txt +
+# pip install .) and must not be mocked — Sphinx's mock objects support
+# no arithmetic, which breaks module-level numpy expressions on import.
+autodoc_mock_imports = [
+    'shapely',
+    'shapely.geometry',
+]
+
 # If true, the current module name will be prepended to all description
 # unit titles
 add_module_names = False
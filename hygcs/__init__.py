@@ -1,23 +1,135 @@
-"""
-HyGCS - Hydro-Geochemical Classification Suite
-================================================
-A Python package for hysteresis analysis and geochemical phase classification
-in concentration-discharge (C-Q) relationships.
-
-Main Components:
-- HARP, Zuecco, Lloyd hysteresis analysis methods
-- CVc/CVq variability analysis (Musolff et al. 2015)
-- C-Q slope calculation (power-law exponents)
-- 6-phase geochemical classification system
-- Comprehensive visualization tools
-
-Authors: Conrad Jackisch, Anita Sanchez
-License: CC-BY 4.0
-Version: 0.5
-"""
-
-from .gcs_v5 import *
-
-__version__ = '0.5'
-__author__ = 'Conrad Jackisch, Anita Sanchez'
-__email__ = 'conrad.jackisch@tbt.tu-freiberg.de'
+"""
+HyGCS - Hydro-Geochemical Classification Suite
+================================================
+A Python package for hysteresis analysis and geochemical phase classification
+in concentration-discharge (C-Q) relationships.
+
+Main Components:
+- HARP, Zuecco, Lloyd hysteresis analysis methods
+- CVc/CVq variability analysis (Musolff et al. 2015)
+- C-Q slope calculation (power-law exponents)
+- 6-phase geochemical classification system
+- Comprehensive visualization tools
+
+Authors: Conrad Jackisch, Anita Sanchez
+License: CC-BY 4.0
+Version: 0.5
+"""
+
+import importlib
+
+__version__ = '0.5'
+__author__ = 'Conrad Jackisch, Anita Sanchez'
+__email__ = 'conrad.jackisch@tbt.tu-freiberg.de'
+
+# =============================================================================
+# LAZY PUBLIC NAMESPACE (PEP 562)
+# =============================================================================
+# Map each public name to the submodule that defines it. Submodules (and
+# their heavy dependencies like plotly) are only imported when
+# one of their names is first accessed, so `import hygcs` stays fast for
+# callers that touch a subset of the API.
+
+_LAZY = {
+    # Main API
+    'classify_geochemical_phase': '.gcs_classification',
+    # Core metrics and preparatory functions
+    'calculate_all_hysteresis_metrics': '.gcs_core',
+    'compute_cvc_cvq_windows': '.gcs_core',
+    'compute_cq_slope': '.gcs_core',
+    'compute_cq_slope_arr': '.gcs_core',
+    'analyze_segment_flow_dynamics': '.gcs_core',
+    'analyze_site_flow_dynamics': '.gcs_core',
+    'compute_change_percentiles': '.gcs_core',
+    # Classification functions
+    'classify_segment_phase': '.gcs_classification',
+    'classify_segment_phases': '.gcs_classification',
+    'classify_cq_behavior_simple': '.gcs_classification',
+    'classify_cq_behavior_simple_vec': '.gcs_classification',
+    'decode_rules': '.gcs_classification',
+    # Visualization
+    'phase_colors': '.gcs_visualization',
+    'phase_names': '.gcs_visualization',
+    'hyphase_colors': '.gcs_visualization',
+    'get_line_style_from_hi_class': '.gcs_visualization',
+    'get_line_styles_from_hi_class': '.gcs_visualization',
+    'calculate_log_thickness': '.gcs_visualization',
+    'create_phase_sequence_plot': '.gcs_visualization',
+    'create_hysteresis_plot': '.gcs_visualization',
+    'create_multi_compound_hysteresis_plot': '.gcs_visualization',
+    'create_diagnostic_plot': '.gcs_visualization',
+    'create_hysteresis_timeline': '.gcs_visualization',
+    'create_hysteresis_summary_stats': '.gcs_visualization',
+    # Individual hysteresis methods
+    'calculate_harp_metrics': '.harp',
+    'calculate_harp_metrics_batch': '.harp',
+    'calculate_zuecco_metrics': '.zuecco',
+    'calculate_zuecco_metrics_batch': '.zuecco',
+    'calculate_zuecco_metrics_multi': '.zuecco',
+    'calculate_lawlerlloyd_metrics': '.lloyd',
+    'calculate_lawlerlloyd_metrics_batch': '.lloyd',
+    # Plotting from individual modules
+    'harp_plot': '.harp',
+    'zuecco_plot': '.zuecco',
+    'lloyd_plot': '.lloyd',
+}
+
+__all__ = [
+    # Main API
+    'classify_geochemical_phase',
+    # Core metrics and preparatory functions
+    'calculate_all_hysteresis_metrics',
+    'compute_cvc_cvq_windows',
+    'compute_cq_slope',
+    'compute_cq_slope_arr',
+    'analyze_segment_flow_dynamics',
+    'analyze_site_flow_dynamics',
+    'compute_change_percentiles',
+    # Classification functions
+    'classify_segment_phase',
+    'classify_segment_phases',
+    'classify_cq_behavior_simple',
+    'classify_cq_behavior_simple_vec',
+    'decode_rules',
+    # Visualization
+    'phase_colors',
+    'phase_names',
+    'hyphase_colors',
+    'get_line_style_from_hi_class',
+    'get_line_styles_from_hi_class',
+    'calculate_log_thickness',
+    'create_phase_sequence_plot',
+    'create_hysteresis_plot',
+    'create_multi_compound_hysteresis_plot',
+    'create_diagnostic_plot',
+    'create_hysteresis_timeline',
+    'create_hysteresis_summary_stats',
+    # Individual hysteresis methods
+    'calculate_harp_metrics',
+    'calculate_harp_metrics_batch',
+    'calculate_zuecco_metrics',
+    'calculate_zuecco_metrics_batch',
+    'calculate_zuecco_metrics_multi',
+    'calculate_lawlerlloyd_metrics',
+    'calculate_lawlerlloyd_metrics_batch',
+]
+
+
+def __getattr__(name):
+    """Resolve public names from their submodule on first access."""
+    try:
+        submodule = _LAZY[name]
+    except KeyError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        ) from None
+    module = importlib.import_module(submodule, __name__)
+    obj = getattr(module, name)
+    # Cache in the module dict so subsequent accesses are plain attribute
+    # lookups and never re-enter __getattr__.
+    globals()[name] = obj
+    return obj
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
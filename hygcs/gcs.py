@@ -1,57 +1,19 @@
 """
 HYDRO-GEOCHEMICAL C-Q CLASSIFICATION SUITE
 ===========================================================
-Toolbox for hysteresis analysis and geochemical phase classification
-in concentration-discharge (C-Q) relationships for potential contaminants
-in water systems.
+Backwards-compatibility alias for the hygcs package namespace.
+
+The re-export table lives in hygcs/__init__.py; this module simply
+delegates attribute access there, so ``import hygcs.gcs`` keeps working
+for old code without duplicating the lazy-loading machinery.
 
 (cc-by) Version 0.5 (2025-12-02) conrad.jackisch@tbt.tu-freiberg.de, antita.sanchez@mineral.tu-freiberg.de
 """
 
-# =============================================================================
-# IMPORTS FROM SUBMODULES
-# =============================================================================
-
-# Core metrics and preparatory functions
-from gcs_core import (
-    calculate_all_hysteresis_metrics,
-    compute_cvc_cvq_windows,
-    compute_cq_slope,
-    analyze_segment_flow_dynamics,
-    compute_change_percentiles
-)
-
-# Classification functions (MAIN API)
-from gcs_classification import (
-    classify_geochemical_phase,
-    classify_segment_phase,
-    classify_cq_behavior_simple
-)
-
-# Visualization
-from gcs_visualization import (
-    phase_colors,
-    phase_names,
-    hyphase_colors,
-    get_line_style_from_hi_class,
-    calculate_log_thickness,
-    create_phase_sequence_plot,
-    create_hysteresis_plot,
-    create_multi_compound_hysteresis_plot,
-    create_diagnostic_plot,
-    create_hysteresis_timeline,
-    create_hysteresis_summary_stats
-)
-
-# Individual hysteresis modules (for direct access if needed)
-from harp import calculate_harp_metrics
-from zuecco import calculate_zuecco_metrics
-from lloyd import calculate_lawlerlloyd_metrics
+import os
+import warnings
 
-# Re-export plotting from individual modules
-from harp import harp_plot
-from zuecco import zuecco_plot
-from lloyd import lloyd_plot
+import hygcs
 
 # =============================================================================
 # MODULE METADATA
@@ -62,43 +24,43 @@ __date__ = '2025-12-02'
 __authors__ = 'Conrad Jackisch, Anita Sanchez'
 __email__ = 'conrad.jackisch@tbt.tu-freiberg.de'
 
-__all__ = [
-    # Main API
-    'classify_geochemical_phase',
-    # Core metrics and preparatory functions
-    'calculate_all_hysteresis_metrics',
-    'compute_cvc_cvq_windows',
-    'compute_cq_slope',
-    'analyze_segment_flow_dynamics',
-    'compute_change_percentiles',
-    # Classification functions
-    'classify_segment_phase',
-    'classify_cq_behavior_simple',
-    # Visualization
-    'phase_colors',
-    'phase_names',
-    'hyphase_colors',
-    'get_line_style_from_hi_class',
-    'calculate_log_thickness',
-    'create_phase_sequence_plot',
-    'create_hysteresis_plot',
-    'create_multi_compound_hysteresis_plot',
-    'create_diagnostic_plot',
-    'create_hysteresis_timeline',
-    'create_hysteresis_summary_stats',
-    # Individual hysteresis methods
-    'calculate_harp_metrics',
-    'calculate_zuecco_metrics',
-    'calculate_lawlerlloyd_metrics',
-]
+__all__ = list(hygcs.__all__)
+
+warnings.warn(
+    "hygcs.gcs is a backwards-compatibility alias; import hygcs directly",
+    DeprecationWarning,
+    stacklevel=2,
+)
+
+
+def __getattr__(name):
+    """Delegate attribute access to the hygcs package namespace."""
+    try:
+        return getattr(hygcs, name)
+    except AttributeError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        ) from None
+
+
+def __dir__():
+    return sorted(set(list(globals()) + dir(hygcs)))
+
 
 # =============================================================================
 # WELCOME MESSAGE
 # =============================================================================
 
-print("=" * 70)
-print("GCS v0.5 - Geochemical C-Q Classification Suite")
-print("=" * 70)
-print("USAGE: import gcs as gcs")
-print("       classified = gcs.classify_geochemical_phase(data, sites, ...)")
-print("=" * 70)
+def print_banner():
+    """Print the GCS welcome/usage banner."""
+    print("=" * 70)
+    print("GCS v0.5 - Geochemical C-Q Classification Suite")
+    print("=" * 70)
+    print("USAGE: import gcs as gcs")
+    print("       classified = gcs.classify_geochemical_phase(data, sites, ...)")
+    print("=" * 70)
+
+
+# Importing a module should be silent by default; opt in via environment.
+if os.environ.get('HYGCS_BANNER') == '1':
+    print_banner()
@@ -24,15 +24,17 @@ Implements hierarchical rule-based classification for 6 geochemical phases:
 Version 0.5 (2025-12-02) (cc-by) conrad.jackisch@tbt.tu-freiberg.de, antita.sanchez@mineral.tu-freiberg.de
 """
 
+import math
+
 import pandas as pd
 import numpy as np
 from typing import List, Tuple, Dict, Optional
 
 # Import from core module (renamed functions in v0.5)
-from gcs_core import (
+from .gcs_core import (
     compute_cvc_cvq_windows,
-    compute_cq_slope,
-    analyze_segment_flow_dynamics,
+    compute_cq_slope_arr,
+    analyze_site_flow_dynamics,
     compute_change_percentiles
 )
 
@@ -69,11 +71,11 @@ def classify_segment_phase(
     hi_harp = row.get('window_HI_harp', 0.0)
     
     # Use Zuecco as primary (most robust), with fallback
-    if not np.isnan(hi_zuecco):
+    if not math.isnan(hi_zuecco):
         hi = hi_zuecco
-    elif not np.isnan(hi_lloyd):
+    elif not math.isnan(hi_lloyd):
         hi = hi_lloyd
-    elif not np.isnan(hi_harp):
+    elif not math.isnan(hi_harp):
         hi = hi_harp
     else:
         hi = 0.0
@@ -100,6 +102,17 @@ def classify_segment_phase(
     c_trajectory = row.get('C_trajectory', 'stable')
     wai = row.get('WAI', np.nan)
 
+    # Unpack thresholds once; several keys are consulted repeatedly in the
+    # cascade and each percentiles[...] access is a dict hash
+    dC_p01 = percentiles['dC_p01']
+    dC_p08 = percentiles['dC_p08']
+    dC_p25 = percentiles['dC_p25']
+    dC_p90 = percentiles['dC_p90']
+    abs_dC_p75 = percentiles['abs_dC_p75']
+    dQ_p10 = percentiles['dQ_p10']
+    dQ_p25 = percentiles['dQ_p25']
+    dQ_p75 = percentiles['dQ_p75']
+
     rules = []
 
     # ==================================================================================
@@ -107,9 +120,9 @@ def classify_segment_phase(
     # Criteria: Steep C decline + High Q + Positive C-Q slope (dilution signature)
     # ==================================================================================
 
-    current_steep = conc_diff < percentiles['dC_p08']
-    prev_steep = prev_conc_diff < percentiles['dC_p08']
-    prev2_steep = prev2_conc_diff < percentiles['dC_p08']
+    current_steep = conc_diff < dC_p08
+    prev_steep = prev_conc_diff < dC_p08
+    prev2_steep = prev2_conc_diff < dC_p08
 
     q_at_peak = flow_phase in ['at_peak', 'rising', 'early_decline']
     q_high = q_level in ['high', 'medium'] or q_pos == 'high'
@@ -117,7 +130,7 @@ def classify_segment_phase(
     c_was_high = prev_c_pos == 'high' or c_pos == 'high' or c_trajectory in ['steep_decline_from_high', 'steep_decline']
 
     # C-Q slope checks for flushing (positive = dilution)
-    cq_slope_positive = not np.isnan(cq_slope) and cq_slope > 0.15
+    cq_slope_positive = not math.isnan(cq_slope) and cq_slope > 0.15
 
     # Current steep decline during high Q
     if current_steep and (q_at_peak or q_high):
@@ -134,16 +147,16 @@ def classify_segment_phase(
             rules.append('c_was_high')
             
         # WAI (water availability index) can boost confidence
-        if not np.isnan(wai) and wai > 1.0:
+        if not math.isnan(wai) and wai > 1.0:
             rules.append('high_wai_wet')
             confidence = min(0.98, confidence + 0.03)
             
         return 'F', confidence, rules
 
     # Aftermath: previous steep decline, Q still elevated
-    if prev_steep and q_high and not np.isnan(days_since_peak) and days_since_peak < 15:
+    if prev_steep and q_high and not math.isnan(days_since_peak) and days_since_peak < 15:
         rules.extend(['prev_steep_decline', 'q_high', 'recent_peak'])
-        if abs(conc_diff) < percentiles['abs_dC_p75']:
+        if abs(conc_diff) < abs_dC_p75:
             rules.append('aftermath_stable')
             confidence = 0.85 if cq_slope_positive else 0.80
             if cq_slope_positive:
@@ -159,7 +172,7 @@ def classify_segment_phase(
         return 'F', confidence, rules
 
     # Very large (extreme) decline with any Q elevation
-    if conc_diff < percentiles['dC_p01']:
+    if conc_diff < dC_p01:
         rules.append('extreme_decline')
         # Prioritize C-Q slope evidence
         if cq_slope_positive:
@@ -178,7 +191,7 @@ def classify_segment_phase(
     q_not_peaked = flow_phase not in ['at_peak', 'early_decline']
 
     # C-Q slope checks for loading (negative = enrichment)
-    cq_slope_negative = not np.isnan(cq_slope) and cq_slope < -0.15
+    cq_slope_negative = not math.isnan(cq_slope) and cq_slope < -0.15
 
     if c_high_rising:
         rules.extend(['c_high', 'c_rising'])
@@ -200,16 +213,16 @@ def classify_segment_phase(
                 confidence = 0.80
                 
         # WAI during dry conditions boosts loading confidence
-        if not np.isnan(wai) and wai < -1.0:
+        if not math.isnan(wai) and wai < -1.0:
             rules.append('low_wai_accumulation')
             confidence = min(0.98, confidence + 0.03)
             
         return 'L', confidence, rules
 
     # Large concentration increase
-    if conc_diff > percentiles['dC_p90']:
+    if conc_diff > dC_p90:
         rules.append('large_c_increase')
-        if flow_diff <= percentiles['dQ_p75']:
+        if flow_diff <= dQ_p75:
             rules.append('q_stable')
             confidence = 0.90 if cq_slope_negative else 0.85
             if cq_slope_negative:
@@ -221,13 +234,13 @@ def classify_segment_phase(
     # Criteria: Low HI + Stable + Flat C-Q slope (buffered system)
     # ==================================================================================
 
-    in_post_flush = (prev_conc_diff < percentiles['dC_p25']) or \
-                    (row.get('prev2_conc_diff', 0) < percentiles['dC_p08'])
+    in_post_flush = (prev_conc_diff < dC_p25) or \
+                    (row.get('prev2_conc_diff', 0) < dC_p08)
     post_peak = flow_phase in ['post_peak', 'late_decline'] or \
-                (not np.isnan(days_since_peak) and days_since_peak > 5 and days_since_peak < 30)
+                (not math.isnan(days_since_peak) and days_since_peak > 5 and days_since_peak < 30)
 
     # Check C-Q slope is near-zero (chemostatic signature)
-    cq_slope_flat = np.isnan(cq_slope) or abs(cq_slope) < 0.1
+    cq_slope_flat = math.isnan(cq_slope) or abs(cq_slope) < 0.1
 
     if abs(hi) < 0.12 and hi_transition == 'stable':
         rules.extend(['low_hi', 'stable_hi'])
@@ -236,7 +249,7 @@ def classify_segment_phase(
         if cq_slope_flat:
             rules.append('flat_cq_slope_chemostatic')
             
-        if not (c_high_rising or (q_high and abs(conc_diff) > percentiles['abs_dC_p75'])):
+        if not (c_high_rising or (q_high and abs(conc_diff) > abs_dC_p75)):
             # Exclude post-flush recovery (that's Dilution, not Chemostatic)
             if not (in_post_flush and post_peak):
                 rules.append('not_dynamic')
@@ -250,11 +263,11 @@ def classify_segment_phase(
     # ==================================================================================
 
     post_peak_phase = flow_phase in ['post_peak', 'late_decline', 'stable'] or \
-                      (not np.isnan(days_since_peak) and days_since_peak > 5)
+                      (not math.isnan(days_since_peak) and days_since_peak > 5)
     q_declining_moderate = flow_diff < 0
-    c_stable_or_recovering = abs(conc_diff) < percentiles['abs_dC_p75']
-    prev_c_declining = prev_conc_diff < percentiles['dC_p25']
-    prev2_c_declining = row.get('prev2_conc_diff', 0) < percentiles['dC_p08']
+    c_stable_or_recovering = abs(conc_diff) < abs_dC_p75
+    prev_c_declining = prev_conc_diff < dC_p25
+    prev2_c_declining = row.get('prev2_conc_diff', 0) < dC_p08
     c_depleted = c_pos in ['low', 'medium']
 
     # Post-flush recovery: Q declining, C stabilizing after recent flush
@@ -267,7 +280,7 @@ def classify_segment_phase(
             return 'D', 0.75, rules
 
     # Alternative: Large Q drop with small C change post-peak
-    if post_peak_phase and flow_diff < percentiles['dQ_p10'] and abs(conc_diff) < percentiles['abs_dC_p75']:
+    if post_peak_phase and flow_diff < dQ_p10 and abs(conc_diff) < abs_dC_p75:
         rules.extend(['post_peak', 'large_q_drop', 'c_not_changing'])
         if prev_c_declining or prev2_c_declining:
             rules.append('recent_flush')
@@ -279,11 +292,11 @@ def classify_segment_phase(
     # ==================================================================================
 
     late_cycle = flow_phase in ['low', 'late_decline'] or q_level == 'low'
-    both_declining = flow_diff < percentiles['dQ_p25'] and conc_diff < percentiles['dC_p25']
+    both_declining = flow_diff < dQ_p25 and conc_diff < dC_p25
 
-    if not np.isnan(cvc_cvq) and cvc_cvq < 0.8:
+    if not math.isnan(cvc_cvq) and cvc_cvq < 0.8:
         rules.append('low_cvc_cvq')
-        if flow_diff < percentiles['dQ_p25']:
+        if flow_diff < dQ_p25:
             rules.append('q_declining')
             if late_cycle:
                 rules.append('late_cycle')
@@ -308,6 +321,374 @@ def classify_segment_phase(
     return 'V', conf, rules
 
 
+# Fixed vocabularies for the categorical columns used by the classifier.
+# Comparing int8 category codes is far cheaper than per-element string
+# equality, so the vectorized cascade works on codes throughout.
+POSITION_CATS = ('low', 'medium', 'high')
+FLOW_PHASE_CATS = ('unknown', 'rising', 'at_peak', 'early_decline',
+                   'post_peak', 'late_decline', 'stable', 'low')
+C_TRAJECTORY_CATS = ('stable', 'steep_decline_from_high', 'steep_decline',
+                     'gradual_decline', 'rising_to_max', 'large_increase',
+                     'moderate_increase', 'at_maximum')
+BEHAVIOR_CATS = ('static', 'quasi-chemostatic', 'source variation',
+                 'connectivity', 'recovery', 'dispersion', 'accumulation')
+
+_POS_LOW, _POS_MEDIUM, _POS_HIGH = 0, 1, 2
+(_FP_UNKNOWN, _FP_RISING, _FP_AT_PEAK, _FP_EARLY_DECLINE,
+ _FP_POST_PEAK, _FP_LATE_DECLINE, _FP_STABLE, _FP_LOW) = range(8)
+
+
+def _cat_codes(values, categories) -> np.ndarray:
+    """Int8 category codes for *values*; labels outside *categories* map to -1."""
+    if isinstance(values, pd.Series):
+        # Columns that already carry the right categorical dtype hand over
+        # their stored codes without re-matching any strings
+        if isinstance(values.dtype, pd.CategoricalDtype) and \
+                tuple(values.cat.categories) == tuple(categories):
+            return values.cat.codes.to_numpy()
+        values = values.to_numpy()
+    return pd.Categorical(values, categories=categories).codes
+
+
+# Diagnostic rule names in classifier program order; each gets one bit of the
+# rules_bits column, so the hot path ORs integers instead of building a list
+# of strings per segment.
+RULE_BITS = {name: 1 << i for i, name in enumerate([
+    'current_steep_decline', 'q_high_or_peak', 'positive_cq_slope_dilution',
+    'c_was_high', 'high_wai_wet', 'prev_steep_decline', 'q_high',
+    'recent_peak', 'aftermath_stable', 'positive_cq_slope_confirms',
+    'prev2_steep_decline', 'q_at_peak', 'positive_cq_slope',
+    'extreme_decline', 'positive_cq_slope_strong', 'q_elevated',
+    'c_high', 'c_rising', 'negative_cq_slope_enrichment', 'q_not_peaked',
+    'low_wai_accumulation', 'large_c_increase', 'q_stable',
+    'negative_cq_slope_confirms', 'low_hi', 'stable_hi',
+    'flat_cq_slope_chemostatic', 'not_dynamic', 'post_peak', 'q_declining',
+    'c_stable', 'recent_flush', 'c_depleted', 'large_q_drop',
+    'c_not_changing', 'low_cvc_cvq', 'late_cycle', 'both_declining',
+    'fallback_variable',
+])}
+
+
+def decode_rules(bits):
+    """
+    Decode rules_bits values back into '|'-joined diagnostic rule strings.
+
+    bits :: int or array-like Bitmask(s) as produced by classify_segment_phases
+
+    Returns :: str or list of str Rule names in classifier program order
+    """
+    if isinstance(bits, (int, np.integer)):
+        return '|'.join(name for name, bit in RULE_BITS.items()
+                        if int(bits) & bit)
+    return ['|'.join(name for name, bit in RULE_BITS.items() if int(b) & bit)
+            for b in np.asarray(bits, dtype=np.uint64)]
+
+
+def classify_segment_phases(
+    temporal_df: pd.DataFrame,
+    percentiles: Dict
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized twin of :func:`classify_segment_phase` for whole DataFrames.
+
+    Applies the same hierarchical rule cascade (F > L > C > D > R > V) to all
+    segments at once using boolean masks on entire columns instead of one
+    Python call per row. Results are identical to the per-row classifier,
+    including the diagnostic rules accumulated by partially matched tiers.
+
+    temporal_df :: pd.DataFrame Segment table with hysteresis, flow, temporal
+        context, and C-Q slope columns (as assembled by classify_geochemical_phase)
+    percentiles :: dict Percentile thresholds for classification
+
+    Returns :: tuple (phases, confidences, rules_bits)
+        - phases: np.ndarray of str, one of 'F', 'L', 'C', 'D', 'R', 'V'
+        - confidences: np.ndarray of float, 0.0-1.0
+        - rules_bits: np.ndarray of uint64 diagnostic bitmasks (see RULE_BITS;
+          decode with decode_rules)
+    """
+    n = len(temporal_df)
+
+    def _col(name, default):
+        if name in temporal_df.columns:
+            return temporal_df[name].to_numpy()
+        return np.full(n, default)
+
+    def _codes(name, default, categories):
+        if name in temporal_df.columns:
+            return _cat_codes(temporal_df[name], categories)
+        code = categories.index(default) if default in categories else -1
+        return np.full(n, code, dtype=np.int8)
+
+    # Extract variables (same defaults as the per-row classifier)
+    hi_zuecco = _col('window_HI_zuecco', 0.0)
+    hi_lloyd = _col('window_HI_lloyd', 0.0)
+    hi_harp = _col('window_HI_harp', 0.0)
+
+    # Use Zuecco as primary (most robust), with fallback
+    with np.errstate(invalid='ignore'):
+        hi = np.where(
+            ~np.isnan(hi_zuecco), hi_zuecco,
+            np.where(~np.isnan(hi_lloyd), hi_lloyd,
+                     np.where(~np.isnan(hi_harp), hi_harp, 0.0))
+        )
+
+    q_pos = _codes('Q_position', 'medium', POSITION_CATS)
+    c_pos = _codes('C_position', 'medium', POSITION_CATS)
+    flow_diff = _col('flow_diff', 0.0)
+    conc_diff = _col('conc_diff', 0.0)
+    cvc_cvq = _col('CVc_CVq', np.nan)
+    cq_slope = _col('cq_slope_loglog', np.nan)
+
+    # High-res dynamics
+    flow_phase = _codes('highres_flow_phase', 'unknown', FLOW_PHASE_CATS)
+    days_since_peak = _col('highres_days_since_peak', np.nan)
+    if 'highres_q_level' in temporal_df.columns:
+        q_level = _cat_codes(temporal_df['highres_q_level'], POSITION_CATS)
+    else:
+        q_level = q_pos
+
+    # Temporal context
+    hi_stable = _codes('HI_transition', 'stable', ('stable',)) == 0
+    prev_c_pos = _codes('prev_C_position', 'none', POSITION_CATS)
+    prev_conc_diff = _col('prev_conc_diff', 0.0)
+    prev2_conc_diff = _col('prev2_conc_diff', 0.0)
+    c_trajectory = _codes('C_trajectory', 'stable', C_TRAJECTORY_CATS)
+    wai = _col('WAI', np.nan)
+
+    dsp_valid = ~pd.isna(days_since_peak)
+    cq_valid = ~pd.isna(cq_slope)
+    abs_conc_diff = np.abs(conc_diff)
+
+    # Thresholds as plain locals (one dict lookup each, not one per mask)
+    dC_p01 = percentiles['dC_p01']
+    dC_p08 = percentiles['dC_p08']
+    dC_p25 = percentiles['dC_p25']
+    dC_p90 = percentiles['dC_p90']
+    abs_dC_p75 = percentiles['abs_dC_p75']
+    dQ_p10 = percentiles['dQ_p10']
+    dQ_p25 = percentiles['dQ_p25']
+    dQ_p75 = percentiles['dQ_p75']
+
+    # Shared predicates (identical thresholds to classify_segment_phase)
+    current_steep = conc_diff < dC_p08
+    prev_steep = prev_conc_diff < dC_p08
+    prev2_steep = prev2_conc_diff < dC_p08
+
+    q_at_peak = np.isin(flow_phase, (_FP_AT_PEAK, _FP_RISING, _FP_EARLY_DECLINE))
+    q_high = np.isin(q_level, (_POS_HIGH, _POS_MEDIUM)) | (q_pos == _POS_HIGH)
+
+    c_was_high = (
+        (prev_c_pos == _POS_HIGH) | (c_pos == _POS_HIGH)
+        | np.isin(c_trajectory,
+                  (C_TRAJECTORY_CATS.index('steep_decline_from_high'),
+                   C_TRAJECTORY_CATS.index('steep_decline')))
+    )
+
+    cq_slope_positive = cq_valid & (cq_slope > 0.15)
+    cq_slope_negative = cq_valid & (cq_slope < -0.15)
+    cq_slope_flat = ~cq_valid | (np.abs(cq_slope) < 0.1)
+
+    wai_valid = ~pd.isna(wai)
+
+    c_high_rising = (c_pos == _POS_HIGH) & (conc_diff > 0)
+    q_not_peaked = ~np.isin(flow_phase, (_FP_AT_PEAK, _FP_EARLY_DECLINE))
+
+    in_post_flush = (prev_conc_diff < dC_p25) | \
+                    (prev2_conc_diff < dC_p08)
+    post_peak = np.isin(flow_phase, (_FP_POST_PEAK, _FP_LATE_DECLINE)) | \
+                (dsp_valid & (days_since_peak > 5) & (days_since_peak < 30))
+
+    post_peak_phase = np.isin(flow_phase,
+                              (_FP_POST_PEAK, _FP_LATE_DECLINE, _FP_STABLE)) | \
+                      (dsp_valid & (days_since_peak > 5))
+    prev_c_declining = prev_conc_diff < dC_p25
+    prev2_c_declining = prev2_conc_diff < dC_p08
+    c_depleted = np.isin(c_pos, (_POS_LOW, _POS_MEDIUM))
+
+    late_cycle = np.isin(flow_phase, (_FP_LOW, _FP_LATE_DECLINE)) | \
+        (q_level == _POS_LOW)
+    both_declining = (flow_diff < dQ_p25) & \
+                     (conc_diff < dC_p25)
+
+    # Hierarchical assignment: each tier only claims still-unassigned rows.
+    # Preallocated typed arrays (single-char unicode, not object) keep the
+    # tier writes free of per-element boxing.
+    phases = np.full(n, 'V', dtype='<U1')
+    confidences = np.full(n, 0.40)
+    assigned = np.zeros(n, dtype=bool)
+    rule_sites = []  # (rule_name, mask) in program order of the row classifier
+
+    # PRIORITY 1: FLUSHING ---------------------------------------------------
+    f1 = current_steep & (q_at_peak | q_high) & ~assigned
+    f1_wai = f1 & wai_valid & (wai > 1.0)
+    conf = np.where(cq_slope_positive,
+                    np.where(c_was_high, 0.95, 0.90),
+                    np.where(c_was_high, 0.92, 0.85))
+    conf = np.where(f1_wai, np.minimum(0.98, conf + 0.03), conf)
+    rule_sites += [
+        ('current_steep_decline', f1),
+        ('q_high_or_peak', f1),
+        ('positive_cq_slope_dilution', f1 & cq_slope_positive),
+        ('c_was_high', f1 & c_was_high),
+        ('high_wai_wet', f1_wai),
+    ]
+    phases[f1] = 'F'
+    confidences[f1] = conf[f1]
+    assigned |= f1
+
+    # Aftermath: previous steep decline, Q still elevated
+    f2_outer = prev_steep & q_high & dsp_valid & (days_since_peak < 15) & ~assigned
+    f2 = f2_outer & (abs_conc_diff < abs_dC_p75)
+    rule_sites += [
+        ('prev_steep_decline', f2_outer),
+        ('q_high', f2_outer),
+        ('recent_peak', f2_outer),
+        ('aftermath_stable', f2),
+        ('positive_cq_slope_confirms', f2 & cq_slope_positive),
+    ]
+    phases[f2] = 'F'
+    confidences[f2] = np.where(cq_slope_positive, 0.85, 0.80)[f2]
+    assigned |= f2
+
+    # Extended aftermath: steep decline 2 segments ago
+    f3 = prev2_steep & q_at_peak & ~assigned
+    rule_sites += [
+        ('prev2_steep_decline', f3),
+        ('q_at_peak', f3),
+        ('positive_cq_slope', f3 & cq_slope_positive),
+    ]
+    phases[f3] = 'F'
+    confidences[f3] = np.where(cq_slope_positive, 0.75, 0.70)[f3]
+    assigned |= f3
+
+    # Very large (extreme) decline with any Q elevation
+    f4_outer = (conc_diff < dC_p01) & ~assigned
+    f4_slope = f4_outer & cq_slope_positive
+    f4_q = f4_outer & ~cq_slope_positive & \
+        ((flow_diff > 0) | np.isin(q_pos, (_POS_HIGH, _POS_MEDIUM)))
+    rule_sites += [
+        ('extreme_decline', f4_outer),
+        ('positive_cq_slope_strong', f4_slope),
+        ('q_elevated', f4_q),
+    ]
+    phases[f4_slope] = 'F'
+    confidences[f4_slope] = 0.92
+    phases[f4_q] = 'F'
+    confidences[f4_q] = 0.88
+    assigned |= f4_slope | f4_q
+
+    # PRIORITY 2: LOADING ----------------------------------------------------
+    l1 = c_high_rising & ~assigned
+    l1_wai = l1 & wai_valid & (wai < -1.0)
+    conf = np.where(cq_slope_negative,
+                    np.where(q_not_peaked, 0.95, 0.92),
+                    np.where(q_not_peaked, 0.90, 0.80))
+    conf = np.where(l1_wai, np.minimum(0.98, conf + 0.03), conf)
+    rule_sites += [
+        ('c_high', l1),
+        ('c_rising', l1),
+        ('negative_cq_slope_enrichment', l1 & cq_slope_negative),
+        ('q_not_peaked', l1 & q_not_peaked),
+        ('low_wai_accumulation', l1_wai),
+    ]
+    phases[l1] = 'L'
+    confidences[l1] = conf[l1]
+    assigned |= l1
+
+    # Large concentration increase
+    l2_outer = (conc_diff > dC_p90) & ~assigned
+    l2 = l2_outer & (flow_diff <= dQ_p75)
+    rule_sites += [
+        ('large_c_increase', l2_outer),
+        ('q_stable', l2),
+        ('negative_cq_slope_confirms', l2 & cq_slope_negative),
+    ]
+    phases[l2] = 'L'
+    confidences[l2] = np.where(cq_slope_negative, 0.90, 0.85)[l2]
+    assigned |= l2
+
+    # PRIORITY 3: CHEMOSTATIC ------------------------------------------------
+    c_outer = (np.abs(hi) < 0.12) & hi_stable & ~assigned
+    c_sel = c_outer & \
+        ~(c_high_rising | (q_high & (abs_conc_diff > abs_dC_p75))) & \
+        ~(in_post_flush & post_peak)
+    rule_sites += [
+        ('low_hi', c_outer),
+        ('stable_hi', c_outer),
+        ('flat_cq_slope_chemostatic', c_outer & cq_slope_flat),
+        ('not_dynamic', c_sel),
+    ]
+    phases[c_sel] = 'C'
+    confidences[c_sel] = np.where(cq_slope_flat, 0.90, 0.85)[c_sel]
+    assigned |= c_sel
+
+    # PRIORITY 4: DILUTION ---------------------------------------------------
+    recent_flush = prev_c_declining | prev2_c_declining
+    d1 = post_peak_phase & (flow_diff < 0) & \
+        (abs_conc_diff < abs_dC_p75) & recent_flush & ~assigned
+    rule_sites += [
+        ('post_peak', d1),
+        ('q_declining', d1),
+        ('c_stable', d1),
+        ('recent_flush', d1),
+        ('c_depleted', d1 & c_depleted),
+    ]
+    phases[d1] = 'D'
+    confidences[d1] = np.where(c_depleted, 0.85, 0.75)[d1]
+    assigned |= d1
+
+    # Alternative: Large Q drop with small C change post-peak
+    d2_outer = post_peak_phase & (flow_diff < dQ_p10) & \
+        (abs_conc_diff < abs_dC_p75) & ~assigned
+    d2 = d2_outer & recent_flush
+    rule_sites += [
+        ('post_peak', d2_outer),
+        ('large_q_drop', d2_outer),
+        ('c_not_changing', d2_outer),
+        ('recent_flush', d2),
+    ]
+    phases[d2] = 'D'
+    confidences[d2] = 0.80
+    assigned |= d2
+
+    # PRIORITY 5: RECESSION --------------------------------------------------
+    cvc_valid = ~pd.isna(cvc_cvq)
+    r1_outer = cvc_valid & (cvc_cvq < 0.8) & ~assigned
+    r1 = r1_outer & (flow_diff < dQ_p25)
+    rule_sites += [
+        ('low_cvc_cvq', r1_outer),
+        ('q_declining', r1),
+        ('late_cycle', r1 & late_cycle),
+    ]
+    phases[r1] = 'R'
+    confidences[r1] = np.where(late_cycle, 0.85, 0.75)[r1]
+    assigned |= r1
+
+    r2 = both_declining & late_cycle & ~assigned
+    rule_sites += [
+        ('both_declining', r2),
+        ('late_cycle', r2),
+    ]
+    phases[r2] = 'R'
+    confidences[r2] = 0.70
+    assigned |= r2
+
+    # FALLBACK: VARIABLE -----------------------------------------------------
+    fallback = ~assigned
+    rule_sites.append(('fallback_variable', fallback))
+    confidences[fallback] = np.where(
+        (abs_conc_diff < 30) & (np.abs(flow_diff) < 30), 0.60, 0.40
+    )[fallback]
+
+    # OR the diagnostic rule bits per row; decode_rules() turns them back
+    # into the '|'-joined strings on demand
+    rules_bits = np.zeros(n, dtype=np.uint64)
+    for rule_name, mask in rule_sites:
+        rules_bits[mask] |= np.uint64(RULE_BITS[rule_name])
+
+    return phases, confidences, rules_bits
+
+
 def classify_geochemical_phase(
     data: pd.DataFrame,
     sites: List[str],
@@ -350,7 +731,7 @@ def classify_geochemical_phase(
         - Window-scale hysteresis (window_HI_*)
         - geochemical_phase: 'F', 'L', 'C', 'D', 'R', 'V'
         - phase_confidence: 0.0-1.0
-        - rules_triggered: Diagnostic information
+        - rules_bits: Diagnostic rule bitmask (decode with decode_rules)
         - highres_*: High-resolution flow metrics (if use_highres=True)
     """
 
@@ -371,24 +752,30 @@ def classify_geochemical_phase(
     cvc_cvq_df = compute_cvc_cvq_windows(data, qcol=qcol, ccol=ccol, window=window)
 
     print("[3/6] Merging data...")
-    # Note renamed column cq_slope_loglog
+    # Note renamed column cq_slope_loglog. The left (segment-based) column
+    # keeps its name; a clash from the window calculation comes back as
+    # cq_slope_loglog_win and is folded in as the fallback via pop, which
+    # avoids the _x/_y rename plus drop (a full BlockManager rebuild).
     merged_df = pd.merge(
         segments_df,
         cvc_cvq_df[['site_id', 'end_date', 'CVc', 'CVq', 'CVc_CVq', 'cq_slope_loglog']],
         on=['site_id', 'end_date'],
-        how='left'
+        how='left',
+        suffixes=(None, '_win')
     )
+    if 'cq_slope_loglog_win' in merged_df.columns:
+        # Prefer segment-based calculation, fallback to window calculation
+        merged_df['cq_slope_loglog'] = merged_df['cq_slope_loglog'].fillna(
+            merged_df.pop('cq_slope_loglog_win'))
 
-    # Handle duplicate cq_slope_loglog column from merge
-    if 'cq_slope_loglog_x' in merged_df.columns and 'cq_slope_loglog_y' in merged_df.columns:
-        # Prefer segment-based calculation (_x), fallback to window calculation (_y)
-        merged_df['cq_slope_loglog'] = merged_df['cq_slope_loglog_x'].fillna(merged_df['cq_slope_loglog_y'])
-        merged_df = merged_df.drop(columns=['cq_slope_loglog_x', 'cq_slope_loglog_y'])
-
-    # Add WAI
+    # Add WAI via an aligned merge (no boxed per-date dict)
     if water_avail_col and water_avail_col in data.columns:
-        wai_map = data.set_index('date')[water_avail_col].to_dict()
-        merged_df['WAI'] = merged_df['end_date'].map(wai_map)
+        wai_df = data[['date', water_avail_col]] \
+            .drop_duplicates('date', keep='last') \
+            .rename(columns={water_avail_col: 'WAI'})
+        merged_df = merged_df.merge(
+            wai_df, left_on='end_date', right_on='date', how='left'
+        ).drop(columns=['date'])
 
     # Global percentiles for absolute Q and C levels
     q_quantiles = data[qcol].quantile([0.25, 0.50, 0.75])
@@ -411,21 +798,43 @@ def classify_geochemical_phase(
     print(f"  ΔC thresholds: steep decline < {percentiles['dC_p08']:.1f} (p08), large increase > {percentiles['dC_p90']:.1f} (p90)")
     print(f"  ΔQ thresholds: moderate decline < {percentiles['dQ_p25']:.1f} (p25), increase > {percentiles['dQ_p75']:.1f} (p75)")
 
-    merged_df['Q_position'] = merged_df['end_flow'].apply(
-        lambda x: 'low' if x < percentiles['Q_p25'] else ('high' if x > percentiles['Q_p75'] else 'medium')
+    # Vectorized percentile bucketing; fixed categories keep downstream
+    # comparisons cheap (integer codes instead of per-row string compares)
+    pos_dtype = pd.CategoricalDtype(list(POSITION_CATS))
+    end_flow = merged_df['end_flow'].to_numpy()
+    end_conc = merged_df['end_conc'].to_numpy()
+    merged_df['Q_position'] = pd.Categorical(
+        np.select([end_flow < percentiles['Q_p25'], end_flow > percentiles['Q_p75']],
+                  ['low', 'high'], default='medium'),
+        dtype=pos_dtype
     )
-    merged_df['C_position'] = merged_df['end_conc'].apply(
-        lambda x: 'low' if x < percentiles['C_p25'] else ('high' if x > percentiles['C_p75'] else 'medium')
+    merged_df['C_position'] = pd.Categorical(
+        np.select([end_conc < percentiles['C_p25'], end_conc > percentiles['C_p75']],
+                  ['low', 'high'], default='medium'),
+        dtype=pos_dtype
     )
 
     # High-resolution flow analysis (if enabled)
     if use_highres and flow_highres is not None:
         print("[4/6] Analyzing high-resolution Q dynamics and window hysteresis...")
-        flow_highres['time'] = pd.to_datetime(flow_highres['time'])
-        
+        # Only parse 'time' when it is not already datetime64, and assign onto
+        # a shallow copy rather than mutating the caller's DataFrame
+        if not pd.api.types.is_datetime64_any_dtype(flow_highres['time']):
+            flow_highres = flow_highres.assign(
+                time=pd.to_datetime(flow_highres['time']))
+
+
+        # Split the segments per site once; re-scanning merged_df with a
+        # boolean mask for every site is O(sites x segments), and sites
+        # without segments now skip the interpolation below entirely
+        site_groups = dict(iter(merged_df.groupby('site_id', sort=False)))
+
         results = []
         for site in sites:
-            site_df = merged_df[merged_df['site_id'] == site].sort_values('end_date').reset_index(drop=True)
+            site_df = site_groups.get(site)
+            if site_df is None or len(site_df) == 0:
+                continue
+            site_df = site_df.sort_values('end_date').reset_index(drop=True)
 
             # High-res subset
             try:
@@ -437,29 +846,47 @@ def classify_geochemical_phase(
                 
             cdummy = data.loc[(data.site_id == site), ccol]
             cdummy.index = data.loc[(data.site_id == site), 'date']
+            # Time-weighted linear interpolation: C-level in pandas and far
+            # cheaper than the scipy spline solver, which ran over the full
+            # site series on every call for no benefit to the window metrics
             site_dyn = pd.concat([hres_dummy, cdummy], axis=1).interpolate(
-                method='spline', order=2, limit=None, limit_direction='forward'
+                method='time', limit=None, limit_direction='forward'
             ).dropna()
 
-            if len(site_df) == 0:
-                continue
-
-            for i in range(len(site_df)):
-                row = site_df.iloc[i].copy()
-
-                # Define window for hysteresis calculation
-                t_extent = pd.Timedelta(row['end_date'] - row['start_date']).days
-                segment_start = pd.to_datetime(row['start_date']) - pd.Timedelta(days=int(t_extent * headex))
-                segment_end = pd.to_datetime(row['end_date']) + pd.Timedelta(days=int(t_extent * tailex))
-
-                try:
-                    # Window-scale hysteresis calculated here
-                    flow_dynamics = analyze_segment_flow_dynamics(
-                        site_dyn.loc[segment_start:segment_end],
-                        percentiles, ccol, qxcol
-                    )
-                except:
-                    flow_dynamics = False
+            # Resolve all hysteresis windows against the high-res index once:
+            # searchsorted on the raw datetime64 values replaces a per-segment
+            # label lookup (.loc binary search + boxing) with integer slicing.
+            # side='right' on the end keeps .loc's inclusive-end semantics.
+            t_arr = site_dyn.index.values
+            seg_starts = pd.to_datetime(site_df['start_date']).to_numpy()
+            seg_ends = pd.to_datetime(site_df['end_date']).to_numpy()
+            t_extents = ((seg_ends - seg_starts) // np.timedelta64(1, 'D')).astype(int)
+            win_starts = seg_starts - \
+                (t_extents * headex).astype(int).astype('timedelta64[D]')
+            win_ends = seg_ends + \
+                (t_extents * tailex).astype(int).astype('timedelta64[D]')
+            win_los = np.searchsorted(t_arr, win_starts)
+            win_his = np.searchsorted(t_arr, win_ends, side='right')
+
+            # Contiguous float32 copies of the site series: the window slices
+            # are re-read once per segment, so halving the per-element width
+            # halves the memory traffic of the whole highres pass
+            q_arr = np.ascontiguousarray(site_dyn[qxcol].to_numpy(np.float32))
+            c_arr = np.ascontiguousarray(site_dyn[ccol].to_numpy(np.float32))
+
+            # Window-scale hysteresis calculated here: one batched call on
+            # the site's raw arrays instead of a DataFrame slice per segment
+            dyn_results = analyze_site_flow_dynamics(
+                q_arr, c_arr, t_arr,
+                win_los, win_his, percentiles, qcol=qxcol, ccol=ccol
+            )
+
+            # Plain dicts instead of per-row Series copies: Series __setitem__
+            # is O(#columns) and iloc[i].copy() materializes a row object per
+            # segment, while dict reads/writes are O(1).
+            rows = site_df.to_dict('records')
+            for i, row in enumerate(rows):
+                flow_dynamics = dyn_results[i]
 
                 if flow_dynamics:
                     for key, val in flow_dynamics.items():
@@ -468,141 +895,103 @@ def classify_geochemical_phase(
                     row['highres_flow_phase'] = 'unknown'
                     row['highres_days_since_peak'] = np.nan
 
-                # Extended temporal context
-                if i > 0:
-                    prev = site_df.iloc[i - 1]
-                    row['prev_behavior'] = prev['behavior']
-                    row['prev_CVc_CVq'] = prev.get('CVc_CVq', np.nan)
-                    row['prev_Q_position'] = prev['Q_position']
-                    row['prev_C_position'] = prev['C_position']
-                    row['prev_conc_diff'] = prev['conc_diff']
-                    row['prev_flow_diff'] = prev['flow_diff']
-
-                    # Simplified HI transition tracking
-                    if flow_dynamics:
-                        current_hi = flow_dynamics.get('window_HI_zuecco', np.nan)
-                        prev_hi = prev.get('window_HI_zuecco', np.nan)
-                        
-                        if not np.isnan(prev_hi) and not np.isnan(current_hi):
-                            if prev_hi > 0.01 and current_hi < -0.01:
-                                row['HI_transition'] = 'pos_to_neg'
-                            elif prev_hi < -0.01 and current_hi > 0.01:
-                                row['HI_transition'] = 'neg_to_pos'
-                            else:
-                                row['HI_transition'] = 'stable'
-                        else:
-                            row['HI_transition'] = 'stable'
-                    else:
-                        row['HI_transition'] = 'stable'
-                        
-                    # Store current window HI values for next iteration
-                    if flow_dynamics:
-                        row['window_HI_zuecco'] = flow_dynamics.get('window_HI_zuecco', np.nan)
-                        row['window_HI_lloyd'] = flow_dynamics.get('window_HI_lloyd', np.nan)
-                        row['window_HI_harp'] = flow_dynamics.get('window_HI_harp', np.nan)
-
-                else:
-                    # First segment
-                    row['prev_behavior'] = 'none'
-                    row['prev_CVc_CVq'] = np.nan
-                    row['prev_Q_position'] = 'none'
-                    row['prev_C_position'] = 'none'
-                    row['prev_conc_diff'] = 0
-                    row['prev_flow_diff'] = 0
-                    row['HI_transition'] = 'first'
-                    
-                    if flow_dynamics:
-                        row['window_HI_zuecco'] = flow_dynamics.get('window_HI_zuecco', np.nan)
-                        row['window_HI_lloyd'] = flow_dynamics.get('window_HI_lloyd', np.nan)
-                        row['window_HI_harp'] = flow_dynamics.get('window_HI_harp', np.nan)
-
-                # Two segments back
-                if i > 1:
-                    prev2 = site_df.iloc[i - 2]
-                    row['prev2_conc_diff'] = prev2['conc_diff']
-                    row['prev2_C_position'] = prev2['C_position']
-                else:
-                    row['prev2_conc_diff'] = 0
-                    row['prev2_C_position'] = 'none'
-
-                # Next segment
-                if i < len(site_df) - 1:
-                    next_seg = site_df.iloc[i + 1]
-                    row['next_C_position'] = next_seg['C_position']
-                else:
-                    row['next_C_position'] = 'none'
-
-                # C trajectory - using percentile-based thresholds
-                conc_diff = row['conc_diff']
-                c_pos = row['C_position']
-                prev_c_pos = row.get('prev_C_position', 'none')
-
-                if conc_diff < percentiles['dC_p08']:
-                    if prev_c_pos == 'high':
-                        row['C_trajectory'] = 'steep_decline_from_high'
-                    else:
-                        row['C_trajectory'] = 'steep_decline'
-                elif conc_diff < percentiles['dC_p25']:
-                    row['C_trajectory'] = 'gradual_decline'
-                elif conc_diff > percentiles['dC_p90']:
-                    row['C_trajectory'] = 'rising_to_max' if c_pos == 'high' else 'large_increase'
-                elif conc_diff > percentiles['dC_p75']:
-                    row['C_trajectory'] = 'moderate_increase'
-                elif c_pos == 'high' and abs(conc_diff) < percentiles['abs_dC_p50']:
-                    row['C_trajectory'] = 'at_maximum'
-                else:
-                    row['C_trajectory'] = 'stable'
+                if flow_dynamics:
+                    # Window HI values doubled out of the highres_ namespace
+                    # for the classifier and for the HI transition tracking
+                    row['window_HI_zuecco'] = flow_dynamics.get('window_HI_zuecco', np.nan)
+                    row['window_HI_lloyd'] = flow_dynamics.get('window_HI_lloyd', np.nan)
+                    row['window_HI_harp'] = flow_dynamics.get('window_HI_harp', np.nan)
 
                 results.append(row)
 
         temporal_df = pd.DataFrame(results)
+
+        # Extended temporal context via groupby-shift: one vectorized pass
+        # replaces the per-row prev/prev2/next bookkeeping that used to live
+        # in the loop (rows within a site are already sorted by end_date).
+        if 'window_HI_zuecco' not in temporal_df.columns:
+            temporal_df['window_HI_zuecco'] = np.nan
+        g = temporal_df.groupby('site_id', sort=False)
+        temporal_df['prev_behavior'] = g['behavior'].shift(1).fillna('none')
+        temporal_df['prev_CVc_CVq'] = g['CVc_CVq'].shift(1)
+        temporal_df['prev_Q_position'] = g['Q_position'].shift(1).fillna('none')
+        temporal_df['prev_C_position'] = g['C_position'].shift(1).fillna('none')
+        temporal_df['prev_conc_diff'] = g['conc_diff'].shift(1).fillna(0)
+        temporal_df['prev_flow_diff'] = g['flow_diff'].shift(1).fillna(0)
+        temporal_df['prev2_conc_diff'] = g['conc_diff'].shift(2).fillna(0)
+        temporal_df['prev2_C_position'] = g['C_position'].shift(2).fillna('none')
+        temporal_df['next_C_position'] = g['C_position'].shift(-1).fillna('none')
+
+        # Simplified HI transition tracking (NaN comparisons fall through
+        # to 'stable', matching the old scalar checks)
+        prev_hi = g['window_HI_zuecco'].shift(1)
+        cur_hi = temporal_df['window_HI_zuecco']
+        temporal_df['HI_transition'] = np.select(
+            [g.cumcount() == 0,
+             (prev_hi > 0.01) & (cur_hi < -0.01),
+             (prev_hi < -0.01) & (cur_hi > 0.01)],
+            ['first', 'pos_to_neg', 'neg_to_pos'],
+            default='stable',
+        )
+
+        # Restore the fixed position dtype lost in the dict round trip, so
+        # every downstream code extraction reuses the stored int8 codes
+        # ('none' placeholders become code -1, which matches no category)
+        pos_dtype = pd.CategoricalDtype(list(POSITION_CATS))
+        for col in ('Q_position', 'C_position', 'prev_Q_position',
+                    'prev_C_position', 'prev2_C_position', 'next_C_position'):
+            temporal_df[col] = temporal_df[col].astype(pos_dtype)
+
+        # C trajectory - using percentile-based thresholds. One np.select
+        # over the whole table replaces the per-segment if/elif cascade;
+        # condition order mirrors the cascade exactly.
+        cd = temporal_df['conc_diff'].to_numpy()
+        c_high = _cat_codes(temporal_df['C_position'],
+                            POSITION_CATS) == _POS_HIGH
+        prev_c_high = _cat_codes(temporal_df['prev_C_position'],
+                                 POSITION_CATS) == _POS_HIGH
+        temporal_df['C_trajectory'] = np.select(
+            [
+                (cd < percentiles['dC_p08']) & prev_c_high,
+                cd < percentiles['dC_p08'],
+                cd < percentiles['dC_p25'],
+                (cd > percentiles['dC_p90']) & c_high,
+                cd > percentiles['dC_p90'],
+                cd > percentiles['dC_p75'],
+                c_high & (np.abs(cd) < percentiles['abs_dC_p50']),
+            ],
+            ['steep_decline_from_high', 'steep_decline', 'gradual_decline',
+             'rising_to_max', 'large_increase', 'moderate_increase',
+             'at_maximum'],
+            default='stable',
+        )
     else:
         print("[4/6] Skipping high-resolution Q analysis (use_highres=False or no data)")
-        temporal_df = merged_df.copy()
-
-        # Add minimal temporal context without highres
-        for site in sites:
-            site_mask = temporal_df['site_id'] == site
-            site_df = temporal_df[site_mask].sort_values('end_date').reset_index(drop=True)
-
-            for i in range(len(site_df)):
-                idx = site_df.index[i]
-
-                if i > 0:
-                    prev_idx = site_df.index[i - 1]
-                    temporal_df.loc[idx, 'prev_conc_diff'] = temporal_df.loc[prev_idx, 'conc_diff']
-                    temporal_df.loc[idx, 'prev_C_position'] = temporal_df.loc[prev_idx, 'C_position']
-                else:
-                    temporal_df.loc[idx, 'prev_conc_diff'] = 0
-                    temporal_df.loc[idx, 'prev_C_position'] = 'none'
-
-                if i > 1:
-                    prev2_idx = site_df.index[i - 2]
-                    temporal_df.loc[idx, 'prev2_conc_diff'] = temporal_df.loc[prev2_idx, 'conc_diff']
-                else:
-                    temporal_df.loc[idx, 'prev2_conc_diff'] = 0
-
-                # Set defaults for highres columns
-                temporal_df.loc[idx, 'highres_flow_phase'] = 'unknown'
-                temporal_df.loc[idx, 'highres_days_since_peak'] = np.nan
-                temporal_df.loc[idx, 'HI_transition'] = 'stable'
+        temporal_df = merged_df.sort_values(['site_id', 'end_date']).reset_index(drop=True)
+
+        # Minimal temporal context without highres: same groupby-shift idiom
+        # as the highres branch instead of per-row .loc scalar assignments
+        g = temporal_df.groupby('site_id', sort=False)
+        temporal_df['prev_conc_diff'] = g['conc_diff'].shift(1).fillna(0)
+        temporal_df['prev_C_position'] = \
+            g['C_position'].shift(1).astype(object).fillna('none')
+        temporal_df['prev2_conc_diff'] = g['conc_diff'].shift(2).fillna(0)
+
+        # Defaults for highres columns
+        temporal_df = temporal_df.assign(
+            highres_flow_phase='unknown',
+            highres_days_since_peak=np.nan,
+            HI_transition='stable',
+        )
 
     print("[5/6] Classifying with percentile-based logic + C-Q slopes...")
 
-    phases = []
-    confidences = []
-    rules_list = []
-
-    for idx, row in temporal_df.iterrows():
-        # classify_segment_phase no longer needs hi_method parameter
-        phase, conf, rules = classify_segment_phase(row, percentiles)
-        phases.append(phase)
-        confidences.append(conf)
-        rules_list.append('|'.join(rules))
+    # Vectorized cascade over the whole table (same logic as classify_segment_phase)
+    phases, confidences, rules_bits = classify_segment_phases(temporal_df, percentiles)
 
     temporal_df['geochemical_phase'] = phases
     temporal_df['phase_confidence'] = confidences
-    temporal_df['rules_triggered'] = rules_list
+    temporal_df['rules_bits'] = rules_bits
 
     print(f"\n[6/6] Complete!")
     print(f"\nPhase distribution:")
@@ -681,6 +1070,65 @@ def classify_cq_behavior_simple(
             return 'accumulation'
 
 
+def classify_cq_behavior_simple_vec(
+    flow_diff: np.ndarray,
+    conc_diff: np.ndarray,
+    flow_range: Tuple[float, float],
+    conc_range: Tuple[float, float],
+    threshold_factor: float = 0.01
+) -> np.ndarray:
+    """
+    Vectorized twin of classify_cq_behavior_simple for whole arrays.
+
+    Classifies every segment at once with np.select; the condition order
+    mirrors the scalar branch order, so results match element-wise.
+
+    Parameters
+    ----------
+    flow_diff, conc_diff : np.ndarray
+        Changes in flow and concentration per segment
+    flow_range, conc_range : tuple
+        (min, max) values for significance testing (shared by all segments)
+    threshold_factor : float
+        Relative threshold for significant change
+
+    Returns
+    -------
+    np.ndarray
+        Behavior classification per segment (same labels as the scalar form)
+    """
+
+    flow_diff = np.asarray(flow_diff)
+    conc_diff = np.asarray(conc_diff)
+
+    flow_delta = flow_range[1] - flow_range[0]
+    conc_delta = conc_range[1] - conc_range[0]
+
+    # Determine if changes are significant
+    if flow_delta > 1e-10:
+        is_flow_changing = np.abs(flow_diff) > threshold_factor * flow_delta
+    else:
+        is_flow_changing = np.zeros(flow_diff.shape, dtype=bool)
+    if conc_delta > 1e-10:
+        is_conc_changing = np.abs(conc_diff) > threshold_factor * conc_delta
+    else:
+        is_conc_changing = np.zeros(conc_diff.shape, dtype=bool)
+
+    return np.select(
+        [
+            ~is_flow_changing & ~is_conc_changing,
+            is_flow_changing & ~is_conc_changing,
+            ~is_flow_changing & is_conc_changing,
+            (flow_diff > 0) & (conc_diff > 0),
+            (flow_diff < 0) & (conc_diff < 0),
+            (flow_diff > 0) & (conc_diff < 0),
+        ],
+        ['static', 'quasi-chemostatic', 'source variation',
+         'connectivity', 'recovery', 'dispersion'],
+        default='accumulation',
+    )
+
+
 # =============================================================================
 # PRIVATE HELPERS
 # =============================================================================
@@ -718,51 +1166,92 @@ def _build_segments(
     flow_range = (analysis_data[qcol].min(), analysis_data[qcol].max())
     conc_range = (analysis_data[ccol].min(), analysis_data[ccol].max())
 
-    results = []
-
-    for site in sites:
-        site_data = analysis_data[analysis_data['site_id'] == site].reset_index(drop=True)
-
+    # Collect per-site column arrays and assemble a single DataFrame at the
+    # end: consecutive pairs are just offset views, so changes, behavior and
+    # the segment table come out of one vectorized pass over concatenated
+    # arrays instead of a DataFrame-plus-concat per site.
+    has_hyphase = 'HydPhase' in analysis_data.columns
+    site_ids = []
+    segment_ids = []
+    start_dates, end_dates = [], []
+    start_q, end_q = [], []
+    start_c, end_c = [], []
+    slope_loglog = []
+    start_hyphase, end_hyphase = [], []
+
+    # One groupby pass instead of a boolean-mask scan per site
+    for site, site_data in analysis_data.groupby('site_id', sort=False):
         if len(site_data) < 2:
             continue
 
-        # Analyze segments (point-to-point)
-        for i in range(len(site_data) - 1):
-            p1, p2 = site_data.iloc[i], site_data.iloc[i + 1]
-
-            # Calculate changes
-            flow_diff = p2[qcol] - p1[qcol]
-            conc_diff = p2[ccol] - p1[ccol]
-
-            # Classify behavior (using simple Williams 1989 classifier)
-            behavior = classify_cq_behavior_simple(flow_diff, conc_diff, flow_range, conc_range)
-
-            # Build result - ONLY segment metadata
-            result = {
-                'site_id': site,
-                'compound': ccol,
-                'segment_id': i,
-                'start_date': p1['date'],
-                'end_date': p2['date'],
-                'start_flow': p1[qcol],
-                'end_flow': p2[qcol],
-                'start_conc': p1[ccol],
-                'end_conc': p2[ccol],
-                'flow_diff': flow_diff,
-                'conc_diff': conc_diff,
-                'behavior': behavior,
-                'cq_slope_loglog': compute_cq_slope(p1[qcol], p2[qcol], p1[ccol], p2[ccol], kind="loglog"),
-                'cq_slope_linear': compute_cq_slope(p1[qcol], p2[qcol], p1[ccol], p2[ccol], kind="linear")
-            }
-
-            # Add HydPhase if available
-            if 'HydPhase' in site_data.columns:
-                result['start_hyphase'] = p1.get('HydPhase', 'unknown')
-                result['end_hyphase'] = p2.get('HydPhase', 'unknown')
-
-            results.append(result)
-
-    return pd.DataFrame(results)
+        q = site_data[qcol].to_numpy()
+        c = site_data[ccol].to_numpy()
+        dates = site_data['date'].to_numpy()
+        n_seg = len(q) - 1
+
+        site_ids.append(np.full(n_seg, site, dtype=object))
+        segment_ids.append(np.arange(n_seg))
+        start_dates.append(dates[:-1])
+        end_dates.append(dates[1:])
+        start_q.append(q[:-1])
+        end_q.append(q[1:])
+        start_c.append(c[:-1])
+        end_c.append(c[1:])
+
+        # Take log10 once per site and diff: interior points would otherwise
+        # have their logs computed twice (once as segment start, once as end)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dlogq = np.diff(np.log10(np.where(q > 0, q, np.nan)))
+            dlogc = np.diff(np.log10(np.where(c > 0, c, np.nan)))
+            slope_loglog.append(
+                np.where(np.abs(dlogq) > 1e-12, dlogc / dlogq, np.nan)
+            )
+
+        if has_hyphase:
+            hyphase = site_data['HydPhase'].to_numpy()
+            start_hyphase.append(hyphase[:-1])
+            end_hyphase.append(hyphase[1:])
+
+    if not site_ids:
+        return pd.DataFrame()
+
+    q1 = np.concatenate(start_q)
+    q2 = np.concatenate(end_q)
+    c1 = np.concatenate(start_c)
+    c2 = np.concatenate(end_c)
+    flow_diff = q2 - q1
+    conc_diff = c2 - c1
+
+    # Build result - ONLY segment metadata
+    segments = pd.DataFrame({
+        'site_id': np.concatenate(site_ids),
+        'compound': ccol,
+        'segment_id': np.concatenate(segment_ids),
+        'start_date': np.concatenate(start_dates),
+        'end_date': np.concatenate(end_dates),
+        'start_flow': q1,
+        'end_flow': q2,
+        'start_conc': c1,
+        'end_conc': c2,
+        'flow_diff': flow_diff,
+        'conc_diff': conc_diff,
+        # Classify behavior (using simple Williams 1989 classifier); store
+        # as a fixed-vocabulary categorical so the column holds int8 codes
+        # instead of one Python string object per segment
+        'behavior': pd.Categorical(
+            classify_cq_behavior_simple_vec(
+                flow_diff, conc_diff, flow_range, conc_range),
+            categories=BEHAVIOR_CATS),
+        'cq_slope_loglog': np.concatenate(slope_loglog),
+        'cq_slope_linear': compute_cq_slope_arr(q1, q2, c1, c2, kind="linear"),
+    })
+
+    # Add HydPhase if available
+    if has_hyphase:
+        segments['start_hyphase'] = np.concatenate(start_hyphase)
+        segments['end_hyphase'] = np.concatenate(end_hyphase)
+
+    return segments
 
 
 # =============================================================================
@@ -771,8 +1260,11 @@ def _build_segments(
 
 __all__ = [
     'classify_segment_phase',
+    'classify_segment_phases',
     'classify_geochemical_phase',
-    'classify_cq_behavior_simple'
+    'classify_cq_behavior_simple',
+    'classify_cq_behavior_simple_vec',
+    'decode_rules'
 ]
 
 print("gcs_classification.py: geochemical phase classification loaded")
@@ -7,22 +7,30 @@ CVc/CVq ratios, C-Q slope calculations, and preparatory statistics.
 (cc-by) Version 0.5 (2025-12-02) conrad.jackisch@tbt.tu-freiberg.de, antita.sanchez@mineral.tu-freiberg.de
 """
 
+import functools
+import math
+
 import pandas as pd
 import numpy as np
-import plotly.express as px
 from typing import Tuple, Dict, List, Optional
-import warnings
 
 # Import individual hysteresis analysis modules
-from harp import calculate_harp_metrics
-from zuecco import calculate_zuecco_metrics
-from lloyd import calculate_lawlerlloyd_metrics
+from .harp import calculate_harp_metrics
+from .zuecco import calculate_zuecco_metrics
+from .lloyd import calculate_lawlerlloyd_metrics
 
 
 # =============================================================================
 # HYSTERESIS METRICS
 # =============================================================================
 
+def _first_row_as_dict(metrics: pd.DataFrame) -> Dict:
+    """First row of a single-row metrics frame as a plain dict."""
+    if len(metrics) == 0:
+        return {}
+    return {col: metrics.iat[0, i] for i, col in enumerate(metrics.columns)}
+
+
 def calculate_all_hysteresis_metrics(
     df: pd.DataFrame,
     time_col: str = 'date',
@@ -84,21 +92,28 @@ def calculate_all_hysteresis_metrics(
             df, time_col=time_col, discharge_col=discharge_col, concentration_col=concentration_col
         )
 
+        # Convert each single-row metrics frame to a plain dict once;
+        # classifications below read from these dicts instead of going back
+        # through pandas indexing
+        harp_metrics = _first_row_as_dict(harp_metrics)
+        zuecco_metrics = _first_row_as_dict(zuecco_metrics)
+        lloyd_metrics = _first_row_as_dict(lloyd_metrics)
+
         # Create classifications based on each method
         classifications = {}
 
         # HARP classification (if available)
-        if 'hyst_class' in harp_metrics.columns:
-            classifications['harp_class'] = harp_metrics['hyst_class'].values[0]
+        if 'hyst_class' in harp_metrics:
+            classifications['harp_class'] = harp_metrics['hyst_class']
 
         # Zuecco classification
-        if 'hyst_class' in zuecco_metrics.columns:
-            classifications['zuecco_class'] = int(zuecco_metrics['hyst_class'].values[0])
+        if 'hyst_class' in zuecco_metrics:
+            classifications['zuecco_class'] = int(zuecco_metrics['hyst_class'])
 
         # Lloyd classification (based on HInew recommended method)
-        if 'mean_HInew' in lloyd_metrics.columns:
-            mean_hinew = lloyd_metrics['mean_HInew'].values[0]
-            if not np.isnan(mean_hinew):
+        if 'mean_HInew' in lloyd_metrics:
+            mean_hinew = lloyd_metrics['mean_HInew']
+            if not math.isnan(mean_hinew):
                 if mean_hinew > 0.1:
                     classifications['lloyd_direction'] = 'clockwise'
                 elif mean_hinew < -0.1:
@@ -109,9 +124,9 @@ def calculate_all_hysteresis_metrics(
                 classifications['lloyd_direction'] = 'unknown'
 
         # Also classify Lawler method for comparison
-        if 'mean_HIL' in lloyd_metrics.columns:
-            mean_hil = lloyd_metrics['mean_HIL'].values[0]
-            if not np.isnan(mean_hil):
+        if 'mean_HIL' in lloyd_metrics:
+            mean_hil = lloyd_metrics['mean_HIL']
+            if not math.isnan(mean_hil):
                 if mean_hil > 0.1:
                     classifications['lawler_direction'] = 'clockwise'
                 elif mean_hil < -0.1:
@@ -122,9 +137,9 @@ def calculate_all_hysteresis_metrics(
                 classifications['lawler_direction'] = 'unknown'
 
         return {
-            'harp_metrics': harp_metrics.to_dict('records')[0] if len(harp_metrics) > 0 else {},
-            'zuecco_metrics': zuecco_metrics.to_dict('records')[0] if len(zuecco_metrics) > 0 else {},
-            'lloyd_metrics': lloyd_metrics.to_dict('records')[0] if len(lloyd_metrics) > 0 else {},
+            'harp_metrics': harp_metrics,
+            'zuecco_metrics': zuecco_metrics,
+            'lloyd_metrics': lloyd_metrics,
             'classifications': classifications,
             'processed_data': {
                 'harp': harp_df,
@@ -174,46 +189,57 @@ def compute_cvc_cvq_windows(df, qcol="Q_mLs", ccol="Zn_mgL", window=5):
         - CVc_CVq: Ratio (>1 = chemodynamic, <1 = chemostatic)
         - cq_slope_loglog: C-Q slope in log-log space (power-law exponent b)
     """
-    df_sorted = df.sort_values(["site_id", "date"]).copy()
-    rows = []
-    for site, g in df_sorted.groupby("site_id"):
+    df_sorted = df.sort_values(["site_id", "date"])
+    results = []
+    for site, g in df_sorted.groupby("site_id", sort=False):
         g = g.reset_index(drop=True)
-        for i in range(window - 1, len(g)):
-            block = g.iloc[i - window + 1 : i + 1]
-
-            mu_q = block[qcol].mean()
-            sd_q = block[qcol].std(ddof=1)
-            mu_c = block[ccol].mean()
-            sd_c = block[ccol].std(ddof=1)
-
-            CVq = sd_q / mu_q if mu_q != 0 else np.nan
-            CVc = sd_c / mu_c if mu_c != 0 else np.nan
-            ratio = CVc / CVq if (CVq not in [0, np.nan]) else np.nan
-
-            # Calculate C-Q slope using log-log regression
-            with warnings.catch_warnings():
-                warnings.filterwarnings('ignore', category=RuntimeWarning)
-                try:
-                    figkx = px.scatter(y=np.log(block[ccol]), x=np.log(block[qcol]), trendline='ols', template='none')
-                    results = px.get_trendline_results(figkx)
-                    slope = results.loc[0].px_fit_results.params[1]
-                except:
-                    slope = np.nan
-
-            rows.append({
-                "site_id": site,
-                "compound": ccol,
-                "window_id": i - window + 1,
-                "start_date": block["date"].min(),
-                "end_date": block["date"].max(),
-                "n_samples": len(block),
-                "CVq": CVq,
-                "CVc": CVc,
-                "CVc_CVq": ratio,
-                "cq_slope_loglog": slope
-            })
-
-    return pd.DataFrame(rows)
+        if len(g) < window:
+            continue
+
+        # Rolling statistics touch the series once (O(N)) instead of
+        # recomputing mean/std over every overlapping block (O(N*W))
+        mu_q = g[qcol].rolling(window).mean().to_numpy()
+        sd_q = g[qcol].rolling(window).std(ddof=1).to_numpy()
+        mu_c = g[ccol].rolling(window).mean().to_numpy()
+        sd_c = g[ccol].rolling(window).std(ddof=1).to_numpy()
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            CVq = np.where(mu_q != 0, sd_q / mu_q, np.nan)
+            CVc = np.where(mu_c != 0, sd_c / mu_c, np.nan)
+            ratio = np.where(CVq != 0, CVc / CVq, np.nan)
+
+            # Log-log C-Q slope from rolling sums (closed-form OLS:
+            # (W*Sxy - Sx*Sy) / (W*Sxx - Sx*Sx)). Windows containing
+            # non-positive values carry non-finite logs and come out NaN.
+            lx = pd.Series(np.log(g[qcol].to_numpy()))
+            ly = pd.Series(np.log(g[ccol].to_numpy()))
+            Sx = lx.rolling(window).sum().to_numpy()
+            Sy = ly.rolling(window).sum().to_numpy()
+            Sxy = (lx * ly).rolling(window).sum().to_numpy()
+            Sxx = (lx * lx).rolling(window).sum().to_numpy()
+            denom = window * Sxx - Sx * Sx
+            slope = np.where(np.abs(denom) > 1e-12,
+                             (window * Sxy - Sx * Sy) / denom, np.nan)
+
+        dates = g["date"].to_numpy()
+        idx = np.arange(window - 1, len(g))
+        results.append(pd.DataFrame({
+            "site_id": site,
+            "compound": ccol,
+            "window_id": idx - (window - 1),
+            "start_date": dates[idx - (window - 1)],
+            "end_date": dates[idx],
+            "n_samples": window,
+            "CVq": CVq[idx],
+            "CVc": CVc[idx],
+            "CVc_CVq": ratio[idx],
+            "cq_slope_loglog": slope[idx]
+        }))
+
+    if not results:
+        return pd.DataFrame()
+
+    return pd.concat(results, ignore_index=True)
 
 
 def compute_cq_slope(q1: float, q2: float, c1: float, c2: float, kind: str = 'loglog') -> float:
@@ -246,13 +272,56 @@ def compute_cq_slope(q1: float, q2: float, c1: float, c2: float, kind: str = 'lo
     if q1 <= 0 or q2 <= 0 or c1 <= 0 or c2 <= 0:
         return np.nan
 
-    with warnings.catch_warnings():
-        warnings.filterwarnings('ignore', category=RuntimeWarning)
+    # math.log10 on guarded-positive scalars cannot warn, so no filter
+    # push/pop is needed per call
+    dlog10q = math.log10(q2) - math.log10(q1)
+    if abs(dlog10q) < 1e-12:
+        return np.nan
+    dlog10c = math.log10(c2) - math.log10(c1)
+    return dlog10c / dlog10q
+
+
+def compute_cq_slope_arr(
+    q1: np.ndarray,
+    q2: np.ndarray,
+    c1: np.ndarray,
+    c2: np.ndarray,
+    kind: str = 'loglog'
+) -> np.ndarray:
+    """
+    Batched compute_cq_slope for arrays of consecutive point pairs.
+
+    Parameters
+    ----------
+    q1, q2 : np.ndarray
+        Discharge values at segment starts and ends.
+    c1, c2 : np.ndarray
+        Concentration values at segment starts and ends.
+    kind : {'loglog','linear'}, optional
+        Same semantics as compute_cq_slope.
+
+    Returns
+    -------
+    np.ndarray
+        One slope per pair, NaN where undefined.
+    """
+    q1 = np.asarray(q1, dtype=float)
+    q2 = np.asarray(q2, dtype=float)
+    c1 = np.asarray(c1, dtype=float)
+    c2 = np.asarray(c2, dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if kind == 'linear':
+            dq = q2 - q1
+            return np.where(np.abs(dq) < 1e-12, np.nan, (c2 - c1) / dq)
+
+        # default: log-log slope
+        # guard against non-positive values (log undefined)
+        valid = (q1 > 0) & (q2 > 0) & (c1 > 0) & (c2 > 0)
         dlog10q = np.log10(q2) - np.log10(q1)
-        if abs(dlog10q) < 1e-12:
-            return np.nan
-        dlog10c = np.log10(c2) - np.log10(c1)
-        return dlog10c / dlog10q
+        slope = (np.log10(c2) - np.log10(c1)) / dlog10q
+        slope = np.where(np.abs(dlog10q) < 1e-12, np.nan, slope)
+        return np.where(valid, slope, np.nan)
 
 
 # =============================================================================
@@ -318,16 +387,112 @@ def analyze_segment_flow_dynamics(
     c_values = segment_data[ccol].values if ccol else None
     times = segment_data.index.values
 
+    return _flow_dynamics_from_arrays(q_values, c_values, times,
+                                      percentiles, qcol, ccol)
+
+
+def analyze_site_flow_dynamics(
+    q_arr: np.ndarray,
+    c_arr: Optional[np.ndarray],
+    t_arr: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    percentiles: Dict,
+    qcol: str = 'Q',
+    ccol: Optional[str] = None
+) -> List[Optional[Dict]]:
+    """
+    Batched version of analyze_segment_flow_dynamics for one site.
+
+    Takes the site's full high-resolution discharge/concentration/time arrays
+    plus precomputed integer window bounds, and analyzes every window from raw
+    array slices instead of materializing a DataFrame per segment. Only the
+    window-scale hysteresis calculation still builds a small frame internally.
+
+    Parameters
+    ----------
+    q_arr, c_arr : np.ndarray
+        Full site discharge and concentration series (c_arr may be None)
+    t_arr : np.ndarray
+        Matching datetime64 time values
+    starts, ends : np.ndarray
+        Integer slice bounds per window (as from np.searchsorted)
+    percentiles : dict
+        Global percentile thresholds for Q levels
+    qcol, ccol : str, optional
+        Column names, only used for labelling the window hysteresis input
+
+    Returns
+    -------
+    list of (dict or None)
+        One analyze_segment_flow_dynamics-style result per window
+    """
+    results = []
+    for lo, hi in zip(starts, ends):
+        q = q_arr[lo:hi]
+        if len(q) == 0 or np.isnan(q).all():
+            results.append(None)
+            continue
+
+        # Mirror the per-segment dropna() across both series
+        c = c_arr[lo:hi] if c_arr is not None else None
+        valid = ~np.isnan(q)
+        if c is not None:
+            valid &= ~np.isnan(c)
+        q = q[valid]
+        t = t_arr[lo:hi][valid]
+        if c is not None:
+            c = c[valid]
+
+        if len(q) < 2:
+            results.append(None)
+            continue
+
+        try:
+            results.append(_flow_dynamics_from_arrays(q, c, t,
+                                                      percentiles, qcol, ccol))
+        except Exception:
+            results.append(None)
+
+    return results
+
+
+def _linreg_slope(y: np.ndarray) -> float:
+    """
+    Closed-form OLS slope of y against x = 0..len(y)-1.
+
+    Equivalent to ``np.polyfit(np.arange(len(y)), y, 1)[0]`` but without the
+    SVD-based least-squares machinery; for an arange x-axis the centered sum
+    of squares has the closed form n*(n^2 - 1)/12.
+    """
+    n = len(y)
+    x_centered = np.arange(n) - (n - 1) / 2.0
+    # sum(x_centered) == 0, so centering y is unnecessary in the dot product
+    return float(np.dot(x_centered, y) / (n * (n * n - 1) / 12.0))
+
+
+def _flow_dynamics_from_arrays(
+    q_values: np.ndarray,
+    c_values: Optional[np.ndarray],
+    times: np.ndarray,
+    percentiles: Dict,
+    qcol: str,
+    ccol: Optional[str]
+) -> Dict:
+    """Compute the flow-dynamics metrics from already-validated array slices."""
+
     # Find peak
     peak_idx = np.argmax(q_values)
     peak_q = q_values[peak_idx]
-    peak_time_idx = segment_data.index[peak_idx]
     peak_time = times[peak_idx]
 
-    # Calculate temporal position of peak
-    segment_duration = pd.Timedelta(times[-1] - times[0]).total_seconds() / 86400  # days
-    days_to_peak = pd.Timedelta(peak_time - times[0]).total_seconds() / 86400
-    days_since_peak = pd.Timedelta(times[-1] - peak_time).total_seconds() / 86400
+    # Calculate temporal position of peak; work on the int64 ns values
+    # directly rather than constructing pd.Timedelta objects per window
+    t_ns = np.asarray(times).view('i8')
+    _NS_PER_DAY = 86_400_000_000_000
+    segment_duration = (t_ns[-1] - t_ns[0]) / _NS_PER_DAY  # days
+    days_to_peak = (t_ns[peak_idx] - t_ns[0]) / _NS_PER_DAY
+    days_since_peak = (t_ns[-1] - t_ns[peak_idx]) / _NS_PER_DAY
 
     if segment_duration > 0:
         peak_position_frac = days_to_peak / segment_duration
@@ -378,16 +543,15 @@ def analyze_segment_flow_dynamics(
         else:
             flow_phase = 'stable'
 
-    # Calculate trend (linear fit)
+    # Calculate trend (closed-form linear fit)
     if len(q_values) > 2:
-        x = np.arange(len(q_values))
-        q_trend = np.polyfit(x, q_values, 1)[0]  # slope per hour
+        q_trend = _linreg_slope(q_values)  # slope per hour
         q_trend_daily = q_trend * 24  # slope per day
 
         # Acceleration (change in trend)
         mid = len(q_values) // 2
-        trend1 = np.polyfit(x[:mid], q_values[:mid], 1)[0] if mid > 1 else 0
-        trend2 = np.polyfit(x[mid:], q_values[mid:], 1)[0] if len(x) - mid > 1 else 0
+        trend1 = _linreg_slope(q_values[:mid]) if mid > 1 else 0
+        trend2 = _linreg_slope(q_values[mid:]) if len(q_values) - mid > 1 else 0
         q_acceleration = (trend2 - trend1) * 24  # per day
     else:
         q_trend_daily = (end_q - start_q) / max(1, segment_duration)
@@ -410,30 +574,26 @@ def analyze_segment_flow_dynamics(
 
     # Calculate HI on the time window (not event-scale)
     if ccol is not None and c_values is not None:
-        segment_data_copy = segment_data.copy()
-        segment_data_copy['date'] = segment_data_copy.index
         try:
-            if len(segment_data_copy) >= 5:
-                # Calculate WINDOW hysteresis metrics
-                window_hyst = calculate_all_hysteresis_metrics(
-                    segment_data_copy,
-                    time_col='date',
-                    discharge_col=qcol,
-                    concentration_col=ccol
-                )
-
-                # Extract window-scale metrics
-                harp_win = window_hyst.get('harp_metrics', {})
-                zuecco_win = window_hyst.get('zuecco_metrics', {})
-                lloyd_win = window_hyst.get('lloyd_metrics', {})
-                class_win = window_hyst.get('classifications', {})
+            if len(q_values) >= 5:
+                # Calculate WINDOW hysteresis metrics; overlapping windows
+                # with identical samples hit the memo cache instead of
+                # rerunning HARP/Zuecco/Lloyd
+                hi_harp, hi_zuecco, hi_lloyd, direction = \
+                    _window_hysteresis_cached(
+                        q_values.tobytes(), c_values.tobytes(),
+                        np.asarray(times).tobytes(),
+                        str(q_values.dtype), str(c_values.dtype),
+                        str(np.asarray(times).dtype),
+                        qcol, ccol
+                    )
 
                 # Store essential metrics
                 result.update({
-                    'window_HI_harp': harp_win.get('area', np.nan),
-                    'window_HI_zuecco': zuecco_win.get('h_index', np.nan),
-                    'window_HI_lloyd': lloyd_win.get('mean_HInew', np.nan),
-                    'window_direction': class_win.get('lloyd_direction', 'unknown')
+                    'window_HI_harp': hi_harp,
+                    'window_HI_zuecco': hi_zuecco,
+                    'window_HI_lloyd': hi_lloyd,
+                    'window_direction': direction
                 })
 
         except Exception as e:
@@ -444,6 +604,54 @@ def analyze_segment_flow_dynamics(
     return result
 
 
+@functools.lru_cache(maxsize=1024)
+def _window_hysteresis_cached(
+    q_bytes: bytes,
+    c_bytes: bytes,
+    t_bytes: bytes,
+    q_dtype: str,
+    c_dtype: str,
+    t_dtype: str,
+    qcol: str,
+    ccol: str
+) -> Tuple[float, float, float, str]:
+    """
+    Window hysteresis metrics memoized on the raw sample bytes.
+
+    Sliding windows frequently repeat the exact same sample set (stride
+    smaller than window, duplicated query dates); keying the cache on
+    ``.tobytes()`` of the inputs lets those repeats skip the three
+    hysteresis modules entirely. Returns ``(HI_harp, HI_zuecco, HI_lloyd,
+    direction)``.
+    """
+    q_values = np.frombuffer(q_bytes, dtype=q_dtype)
+    c_values = np.frombuffer(c_bytes, dtype=c_dtype)
+    times = np.frombuffer(t_bytes, dtype=t_dtype)
+
+    window_df = pd.DataFrame(
+        {qcol: q_values, ccol: c_values, 'date': times}, index=times
+    )
+    window_hyst = calculate_all_hysteresis_metrics(
+        window_df,
+        time_col='date',
+        discharge_col=qcol,
+        concentration_col=ccol
+    )
+
+    # Extract window-scale metrics
+    harp_win = window_hyst.get('harp_metrics', {})
+    zuecco_win = window_hyst.get('zuecco_metrics', {})
+    lloyd_win = window_hyst.get('lloyd_metrics', {})
+    class_win = window_hyst.get('classifications', {})
+
+    return (
+        harp_win.get('area', np.nan),
+        zuecco_win.get('h_index', np.nan),
+        lloyd_win.get('mean_HInew', np.nan),
+        class_win.get('lloyd_direction', 'unknown')
+    )
+
+
 # =============================================================================
 # STATISTICAL THRESHOLDS
 # =============================================================================
@@ -477,44 +685,49 @@ def compute_change_percentiles(
         Percentile thresholds for dC and dQ at various levels (p01, p05, p08, p10, p25, p50, p75, p90, p95)
     """
 
-    changes = []
-    for site in sites:
-        site_data = data[data['site_id'] == site].sort_values('date')
-        if len(site_data) > 1:
-            conc_diffs = site_data[ccol].diff().dropna()
-            flow_diffs = site_data[qcol].diff().dropna()
-            changes.extend([
-                {'conc_diff': cd, 'flow_diff': fd}
-                for cd, fd in zip(conc_diffs, flow_diffs)
-            ])
-
-    changes_df = pd.DataFrame(changes)
+    # Per-site point-to-point changes in one groupby-diff pass; rows where
+    # either diff is undefined (site boundaries, raw NaNs) drop out together,
+    # keeping the conc/flow pairs aligned
+    analysis_data = data[data['site_id'].isin(sites)] \
+        .sort_values(['site_id', 'date'])
+    diffs = analysis_data.groupby('site_id', sort=False)[[ccol, qcol]] \
+        .diff().to_numpy()
+    valid = ~np.isnan(diffs).any(axis=1)
+
+    # One quantile pass per axis instead of a separate scan per threshold
+    conc_diff = diffs[valid, 0]
+    flow_diff = diffs[valid, 1]
+    dC = np.quantile(conc_diff,
+                     [0.01, 0.05, 0.08, 0.10, 0.25, 0.50, 0.75, 0.90, 0.95])
+    dQ = np.quantile(flow_diff, [0.05, 0.10, 0.25, 0.50, 0.75, 0.90])
+    abs_dC = np.quantile(np.abs(conc_diff), [0.50, 0.75])
+    abs_dQ = np.quantile(np.abs(flow_diff), [0.50, 0.75])
 
     percentiles = {
         # Concentration change percentiles
-        'dC_p01': changes_df['conc_diff'].quantile(0.01),
-        'dC_p05': changes_df['conc_diff'].quantile(0.05),
-        'dC_p08': changes_df['conc_diff'].quantile(0.08),  # Optimized for flushing detection
-        'dC_p10': changes_df['conc_diff'].quantile(0.10),
-        'dC_p25': changes_df['conc_diff'].quantile(0.25),
-        'dC_p50': changes_df['conc_diff'].quantile(0.50),
-        'dC_p75': changes_df['conc_diff'].quantile(0.75),
-        'dC_p90': changes_df['conc_diff'].quantile(0.90),  # Large increase threshold
-        'dC_p95': changes_df['conc_diff'].quantile(0.95),
+        'dC_p01': dC[0],
+        'dC_p05': dC[1],
+        'dC_p08': dC[2],  # Optimized for flushing detection
+        'dC_p10': dC[3],
+        'dC_p25': dC[4],
+        'dC_p50': dC[5],
+        'dC_p75': dC[6],
+        'dC_p90': dC[7],  # Large increase threshold
+        'dC_p95': dC[8],
 
         # Flow change percentiles
-        'dQ_p05': changes_df['flow_diff'].quantile(0.05),
-        'dQ_p10': changes_df['flow_diff'].quantile(0.10),
-        'dQ_p25': changes_df['flow_diff'].quantile(0.25),
-        'dQ_p50': changes_df['flow_diff'].quantile(0.50),
-        'dQ_p75': changes_df['flow_diff'].quantile(0.75),
-        'dQ_p90': changes_df['flow_diff'].quantile(0.90),
+        'dQ_p05': dQ[0],
+        'dQ_p10': dQ[1],
+        'dQ_p25': dQ[2],
+        'dQ_p50': dQ[3],
+        'dQ_p75': dQ[4],
+        'dQ_p90': dQ[5],
 
         # Absolute change percentiles (for stability detection)
-        'abs_dC_p50': changes_df['conc_diff'].abs().quantile(0.50),
-        'abs_dC_p75': changes_df['conc_diff'].abs().quantile(0.75),
-        'abs_dQ_p50': changes_df['flow_diff'].abs().quantile(0.50),
-        'abs_dQ_p75': changes_df['flow_diff'].abs().quantile(0.75),
+        'abs_dC_p50': abs_dC[0],
+        'abs_dC_p75': abs_dC[1],
+        'abs_dQ_p50': abs_dQ[0],
+        'abs_dQ_p75': abs_dQ[1],
     }
 
     return percentiles
@@ -528,7 +741,9 @@ __all__ = [
     'calculate_all_hysteresis_metrics',
     'compute_cvc_cvq_windows',
     'compute_cq_slope',
+    'compute_cq_slope_arr',
     'analyze_segment_flow_dynamics',
+    'analyze_site_flow_dynamics',
     'compute_change_percentiles'
 ]
 
@@ -5,16 +5,17 @@ Plotting suite for hysteresis analysis and phase classification.
 (cc-by) Version 0.5 (2025-12-02) conrad.jackisch@tbt.tu-freiberg.de, antita.sanchez@mineral.tu-freiberg.de
 """
 
+from __future__ import annotations
+
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 from typing import List, Optional, Dict
-import warnings
+
+# NOTE: plotly is imported inside each plotting function so that importing
+# this module for the color tables / numeric helpers stays cheap.
 
 # Import classification function for multi-compound plots
-from gcs_classification import classify_geochemical_phase
+from .gcs_classification import classify_geochemical_phase
 
 # =============================================================================
 # COLOR SCHEMES (V4 ORIGINAL)
@@ -50,6 +51,11 @@ hyphase_colors = {
 # UTILITY FUNCTIONS
 # =============================================================================
 
+# Dash vocabulary shared by the scalar and vectorized style resolvers:
+# index 0 = positive/clockwise, 1 = negative/counter-clockwise, 2 = weak
+_DASH = ('solid', '2px 1px', '1px 1px')
+
+
 def get_line_style_from_hi_class(seg: pd.Series, method: str = 'zuecco') -> str:
     """
     Determine line style from hysteresis classification.
@@ -70,32 +76,100 @@ def get_line_style_from_hi_class(seg: pd.Series, method: str = 'zuecco') -> str:
         zuecco_class = seg.get('window_zuecco_class', -1)
         if zuecco_class == -1:
             hi = seg.get('window_HI_zuecco', 0.0)
-            return 'solid' if hi > 0.1 else ('2px 1px' if hi < -0.1 else '1px 1px')
+            return _DASH[0 if hi > 0.1 else (1 if hi < -0.1 else 2)]
         else:
             if 1 <= zuecco_class <= 4:
-                return 'solid'
+                return _DASH[0]
             elif 5 <= zuecco_class <= 8:
-                return '2px 1px'
+                return _DASH[1]
             else:
-                return '1px 1px'
+                return _DASH[2]
 
     elif method == 'lloyd':
         direction_str = str(seg.get('window_direction', 'unknown')).lower()
         if 'counter' in direction_str or 'anticlockwise' in direction_str:
-            return '2px 1px'
+            return _DASH[1]
         elif 'clockwise' in direction_str:
-            return 'solid'
+            return _DASH[0]
         else:
             hi = seg.get('window_HI_lloyd', 0.0)
-            return 'solid' if hi > 0.1 else ('2px 1px' if hi < -0.1 else '1px 1px')
+            return _DASH[0 if hi > 0.1 else (1 if hi < -0.1 else 2)]
 
     elif method == 'harp':
         area = seg.get('window_HI_harp', 0.0)
         if abs(area) < 10:
-            return '1px 1px'
-        return 'solid' if area > 0 else '2px 1px'
+            return _DASH[2]
+        return _DASH[0] if area > 0 else _DASH[1]
+
+    return _DASH[2]
+
+
+def get_line_styles_from_hi_class(df: pd.DataFrame, method: str = 'zuecco') -> np.ndarray:
+    """
+    Vectorized twin of get_line_style_from_hi_class for whole segment tables.
+
+    Resolves the dash style for every segment at once with boolean masks
+    instead of one scalar dispatch per row; plotting loops index into the
+    returned array.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Segment data with hysteresis classifications
+    method : str
+        Which HI method to use ('zuecco', 'lloyd', 'harp')
+
+    Returns
+    -------
+    np.ndarray
+        Plotly dash style per segment: 'solid', '2px 1px', or '1px 1px'
+    """
+    n = len(df)
+    styles = np.full(n, _DASH[2], dtype=object)
+
+    if method == 'zuecco':
+        if 'window_zuecco_class' in df.columns:
+            cls = df['window_zuecco_class'].to_numpy()
+        else:
+            cls = np.full(n, -1)
+        if 'window_HI_zuecco' in df.columns:
+            hi = df['window_HI_zuecco'].to_numpy()
+        else:
+            hi = np.zeros(n)
+        unclassified = cls == -1
+        styles[(~unclassified & (cls >= 1) & (cls <= 4))
+               | (unclassified & (hi > 0.1))] = _DASH[0]
+        styles[(~unclassified & (cls >= 5) & (cls <= 8))
+               | (unclassified & (hi < -0.1))] = _DASH[1]
 
-    return '1px 1px'
+    elif method == 'lloyd':
+        if 'window_direction' in df.columns:
+            direction = df['window_direction'].astype(str).str.lower()
+            counter = direction.str.contains('counter|anticlockwise',
+                                             regex=True).to_numpy()
+            clockwise = (~counter
+                         & direction.str.contains('clockwise').to_numpy())
+        else:
+            counter = np.zeros(n, dtype=bool)
+            clockwise = np.zeros(n, dtype=bool)
+        if 'window_HI_lloyd' in df.columns:
+            hi = df['window_HI_lloyd'].to_numpy()
+        else:
+            hi = np.zeros(n)
+        fallback = ~counter & ~clockwise
+        styles[clockwise | (fallback & (hi > 0.1))] = _DASH[0]
+        styles[counter | (fallback & (hi < -0.1))] = _DASH[1]
+
+    elif method == 'harp':
+        if 'window_HI_harp' in df.columns:
+            area = df['window_HI_harp'].to_numpy()
+        else:
+            area = np.zeros(n)
+        significant = ~(np.abs(area) < 10)
+        styles[significant & (area > 0)] = _DASH[0]
+        styles[significant & ~(area > 0)] = _DASH[1]
+
+    return styles
 
 
 def calculate_log_thickness(hi_values: np.ndarray,
@@ -116,30 +190,29 @@ def calculate_log_thickness(hi_values: np.ndarray,
     np.ndarray
         Thickness values scaled between min and max
     """
-    hi_abs = np.abs(np.asarray(hi_values))
+    hi_abs = np.abs(np.asarray(hi_values, dtype=np.float64))
 
     if len(hi_abs) == 0:
         return np.array([])
 
-    # Suppress warnings for log calculations
-    with warnings.catch_warnings():
-        warnings.filterwarnings('ignore', category=RuntimeWarning)
-        scale_factor = 100
-        log_transformed = np.log10(1 + hi_abs * scale_factor)
+    # log10(1 + x) cannot warn for non-negative input, so no warnings guard
+    scale_factor = 100
+    log_transformed = np.log10(1 + hi_abs * scale_factor)
 
-    has_variance = np.any(hi_abs > 1e-10)
-    if not has_variance:
+    # Compute the significance mask once and reuse it throughout
+    mask = hi_abs > 1e-10
+    if not mask.any():
         return np.full(len(hi_values), min_thickness)
 
-    log_min = np.min(log_transformed[hi_abs > 1e-10])
+    valid = log_transformed[mask]
+    log_min = valid.min()
     log_max = np.max(log_transformed)
 
     if log_max - log_min < 1e-10:
         return np.full(len(hi_values), (min_thickness + max_thickness) / 2)
 
     normalized = np.zeros_like(log_transformed)
-    mask = hi_abs > 1e-10
-    normalized[mask] = (log_transformed[mask] - log_min) / (log_max - log_min)
+    normalized[mask] = (valid - log_min) / (log_max - log_min)
 
     thickness = min_thickness + (max_thickness - min_thickness) * normalized
     thickness[np.isnan(thickness)] = min_thickness
@@ -149,6 +222,8 @@ def calculate_log_thickness(hi_values: np.ndarray,
 
 def _add_phase_legend(fig: go.Figure) -> None:
     """Add phase color legend to figure (helper to avoid duplication)."""
+    import plotly.graph_objects as go
+
     for phase_code, color in phase_colors.items():
         if phase_code and phase_code in phase_names:
             fig.add_trace(
@@ -162,49 +237,124 @@ def _add_phase_legend(fig: go.Figure) -> None:
             )
 
 
-def _plot_hysteresis_segment(fig: go.Figure,
-                             seg: pd.Series,
-                             thickness: float,
-                             line_style_method: str,
-                             hi_col: str,
-                             row: int,
-                             col: int) -> None:
+def _add_segment_batches(fig: go.Figure,
+                         x0, x1, y0, y1,
+                         phases,
+                         dashes,
+                         widths,
+                         row: Optional[int] = None,
+                         col: Optional[int] = None,
+                         hovertexts: Optional[List[str]] = None,
+                         width_step: float = 0.5) -> None:
     """
-    Add single hysteresis segment to figure (helper to avoid duplication).
+    Add segment lines as NaN-separated batched traces (helper to avoid duplication).
+
+    Instead of one go.Scatter per segment, segments are grouped by
+    (color, dash, width bucket) and each group becomes a single trace whose
+    x/y arrays join the segments with None separators. This collapses N
+    traces into O(distinct styles), shrinking the figure JSON and frontend
+    render time dramatically for large segment counts.
 
     Parameters
     ----------
     fig : go.Figure
-        Figure to add trace to
-    seg : pd.Series
-        Segment with start_flow, end_flow, start_conc, end_conc
-    thickness : float
-        Line thickness
-    line_style_method : str
-        Method for determining dash style
-    hi_col : str
-        HI column name for hover info
-    row, col : int
-        Subplot position
+        Figure to add traces to
+    x0, x1, y0, y1 : array-like
+        Segment endpoint coordinates
+    phases : array-like
+        Geochemical phase code per segment (determines color)
+    dashes : array-like
+        Dash style per segment
+    widths : array-like or float
+        Line width per segment (bucketed to width_step) or one shared width
+    row, col : int, optional
+        Subplot position (omit for single-axis figures)
+    hovertexts : list of str, optional
+        Per-segment hover text (applied to both endpoints)
+    width_step : float
+        Bucket size for grouping similar widths into one trace
     """
-    dash = get_line_style_from_hi_class(seg, method=line_style_method)
-    hi_val = seg[hi_col]
+    import plotly.graph_objects as go
+
+    n = len(x0)
+    if n == 0:
+        return
 
-    fig.add_trace(
-        go.Scatter(
-            x=[seg['start_flow'], seg['end_flow']],
-            y=[seg['start_conc'], seg['end_conc']],
+    widths = np.broadcast_to(np.asarray(widths, dtype=float), (n,))
+    buckets = np.round(widths / width_step) * width_step
+
+    # Resolve phase colors through a categorical LUT in one indexing
+    # operation; unknown phases (code -1) fall back to the trailing 'gray'
+    codes = pd.Categorical(phases, categories=list(phase_colors)).codes
+    color_lut = np.array([phase_colors[p] for p in phase_colors] + ['gray'],
+                         dtype=object)
+    colors = color_lut[codes]
+
+    groups: Dict[tuple, List[int]] = {}
+    for i in range(n):
+        key = (colors[i], dashes[i], buckets[i])
+        groups.setdefault(key, []).append(i)
+
+    for (color, dash, width), idxs in groups.items():
+        xs, ys = [], []
+        texts = []
+        for i in idxs:
+            xs.extend((x0[i], x1[i], None))
+            ys.extend((y0[i], y1[i], None))
+            if hovertexts is not None:
+                texts.extend((hovertexts[i], hovertexts[i], None))
+
+        trace = go.Scatter(
+            x=xs, y=ys,
             mode='lines',
-            line=dict(
-                color=phase_colors.get(seg['geochemical_phase'], 'gray'),
-                width=thickness,
-                dash=dash
-            ),
+            line=dict(color=color, width=width, dash=dash),
             showlegend=False,
-            hovertemplate=f"<b>{seg['geochemical_phase']}</b><br>HI: {hi_val:.3f}<extra></extra>"
-        ),
-        row=row, col=col
-    )
+            text=texts if hovertexts is not None else None,
+            hovertemplate='%{text}<extra></extra>' if hovertexts is not None else None
+        )
+        if row is None:
+            fig.add_trace(trace)
+        else:
+            fig.add_trace(trace, row=row, col=col)
+
+
+_classification_cache: Dict[tuple, pd.DataFrame] = {}
+_CLASSIFICATION_CACHE_SIZE = 32
+
+
+def _classify_cached(compound_data: pd.DataFrame,
+                     sites: List[str],
+                     Qx: pd.DataFrame,
+                     ccol: str,
+                     qcol: str) -> pd.DataFrame:
+    """
+    Memoized classify_geochemical_phase for repeated plot renders.
+
+    Re-rendering the multi-compound plot (e.g. from a notebook or
+    dashboard) re-classifies every compound from scratch even though the
+    inputs have not changed. The result is cached keyed on a hash of the
+    input frames plus the column/site arguments; unhashable inputs simply
+    bypass the cache.
+    """
+    try:
+        key = (
+            int(pd.util.hash_pandas_object(compound_data, index=False).sum()),
+            int(pd.util.hash_pandas_object(Qx, index=False).sum())
+            if Qx is not None else None,
+            tuple(sites), ccol, qcol,
+        )
+    except TypeError:
+        return classify_geochemical_phase(compound_data, sites,
+                                          flow_highres=Qx, ccol=ccol,
+                                          qcol=qcol, use_highres=True)
+
+    if key not in _classification_cache:
+        if len(_classification_cache) >= _CLASSIFICATION_CACHE_SIZE:
+            _classification_cache.pop(next(iter(_classification_cache)))
+        _classification_cache[key] = classify_geochemical_phase(
+            compound_data, sites, flow_highres=Qx, ccol=ccol,
+            qcol=qcol, use_highres=True)
+    return _classification_cache[key]
 
 
 def _plot_data_points_with_load(fig: go.Figure,
@@ -233,23 +383,30 @@ def _plot_data_points_with_load(fig: go.Figure,
     show_legend : bool
         Whether to show legend for this trace
     """
+    import plotly.graph_objects as go
+
     if 'HydPhase' not in site_data.columns:
         return
 
-    # Calculate load for sizing
-    site_data['load'] = site_data[ccol] * site_data[qcol] * 86.4
-    load_95 = site_data['load'].quantile(0.95)
-    load_5 = site_data['load'].quantile(0.05)
+    # Calculate load for sizing as local arrays: no mutation of the
+    # (possibly shared) frame, and both percentiles in one pass
+    q_arr = site_data[qcol].to_numpy()
+    c_arr = site_data[ccol].to_numpy()
+    load = c_arr * q_arr * 86.4
+    load_5, load_95 = np.nanpercentile(load, [5, 95])
     load_range = max(load_95 - load_5, 1e-10)
+    sizes_all = 8 + 20 * np.clip((load - load_5) / load_range, 0, 1)
 
-    for phase in site_data['HydPhase'].dropna().unique():
-        phase_data = site_data[site_data['HydPhase'] == phase]
-        sizes = 8 + 20 * np.clip((phase_data['load'] - load_5) / load_range, 0, 1)
+    hyphases = site_data['HydPhase'].to_numpy()
+    for phase in pd.unique(hyphases[pd.notna(hyphases)]):
+        sel = hyphases == phase
+        sizes = sizes_all[sel]
 
+        # Scattergl: WebGL markers scale to far larger point counts than SVG
         fig.add_trace(
-            go.Scatter(
-                x=phase_data[qcol],
-                y=phase_data[ccol],
+            go.Scattergl(
+                x=q_arr[sel],
+                y=c_arr[sel],
                 mode='markers',
                 marker=dict(
                     size=sizes,
@@ -305,7 +462,11 @@ def create_hysteresis_plot(data: pd.DataFrame,
     go.Figure
         Hysteresis plot figure
     """
-    analysis_df = data.copy()
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    # Read-only access throughout, so no defensive copy is needed
+    analysis_df = data
 
     if len(analysis_df) == 0:
         fig = go.Figure()
@@ -329,40 +490,45 @@ def create_hysteresis_plot(data: pd.DataFrame,
     if hi_col not in analysis_df.columns:
         raise ValueError(f'{hi_col} not found. Ensure data is from classify_geochemical_phase().')
 
+    # One groupby pass instead of a boolean-mask scan per site
+    by_site = dict(iter(analysis_df.groupby('site_id', sort=False)))
+
     # Plot each site
     for idx, site in enumerate(sites):
         col = idx + 1
-        site_analysis = analysis_df[analysis_df['site_id'] == site]
+        site_analysis = by_site.get(site)
 
-        if len(site_analysis) < 1:
+        if site_analysis is None or len(site_analysis) < 1:
             continue
 
-        hi_values = site_analysis[hi_col].values
+        # Hoist the needed columns to arrays once and emit the segments as
+        # NaN-separated batched traces grouped by style. float32 suffices
+        # for on-screen precision and halves the serialized payload.
+        start_flow = site_analysis['start_flow'].to_numpy(dtype=np.float32)
+        end_flow = site_analysis['end_flow'].to_numpy(dtype=np.float32)
+        start_conc = site_analysis['start_conc'].to_numpy(dtype=np.float32)
+        end_conc = site_analysis['end_conc'].to_numpy(dtype=np.float32)
+        start_date = site_analysis['start_date'].to_numpy()
+        end_date = site_analysis['end_date'].to_numpy()
+        phases = site_analysis['geochemical_phase'].to_numpy()
+        hi_values = site_analysis[hi_col].to_numpy(dtype=np.float32)
         thicknesses = calculate_log_thickness(hi_values)
+        # Resolve every dash style in one vectorized pass
+        dashes = get_line_styles_from_hi_class(site_analysis, line_style_method)
 
-        for i, seg in site_analysis.iterrows():
-            thickness = thicknesses[i - site_analysis.index[0]]
+        hovertexts = [f"<b>{phase}</b><br>HI: {hi:.3f}"
+                      for phase, hi in zip(phases, hi_values)]
 
-            # Hysteresis loop
-            _plot_hysteresis_segment(fig, seg, thickness, line_style_method, hi_col, row=1, col=col)
+        # Hysteresis loops
+        _add_segment_batches(fig, start_flow, end_flow, start_conc, end_conc,
+                             phases, dashes, thicknesses, row=1, col=col,
+                             hovertexts=hovertexts)
 
-            # Timeline
-            if show_timeline:
-                dash = get_line_style_from_hi_class(seg, method=line_style_method)
-                fig.add_trace(
-                    go.Scatter(
-                        x=[seg['start_date'], seg['end_date']],
-                        y=[seg['start_conc'], seg['end_conc']],
-                        mode='lines',
-                        line=dict(
-                            color=phase_colors.get(seg['geochemical_phase'], 'gray'),
-                            width=2,
-                            dash=dash
-                        ),
-                        showlegend=False
-                    ),
-                    row=2, col=col
-                )
+        # Timeline
+        if show_timeline:
+            _add_segment_batches(fig, start_date, end_date,
+                                 start_conc, end_conc,
+                                 phases, dashes, 2, row=2, col=col)
 
     # Update axes
     fig.update_xaxes(type='log', title_text=f'Flow ({flow_unit})', row=1)
@@ -438,6 +604,9 @@ def create_multi_compound_hysteresis_plot(data: pd.DataFrame,
     go.Figure
         Multi-panel plot
     """
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
     n_compounds = len(ccols)
     n_sites = len(sites)
 
@@ -482,22 +651,26 @@ def create_multi_compound_hysteresis_plot(data: pd.DataFrame,
         else:
             comp_cmax = cxmax[comp_idx]
 
-        # Analyze hysteresis for THIS compound
-        classified = classify_geochemical_phase(compound_data, sites, flow_highres=Qx,
-                                                ccol=ccol, qcol=qcol, use_highres=True)
+        # Analyze hysteresis for THIS compound (memoized across re-renders)
+        classified = _classify_cached(compound_data, sites, Qx, ccol, qcol)
 
         hi_col = f'window_HI_{hi_method}'
 
+        # One groupby pass per compound instead of a mask scan per site
+        data_by_site = dict(iter(compound_data.groupby('site_id', sort=False)))
+        classified_by_site = dict(iter(classified.groupby('site_id', sort=False)))
+        empty_analysis = classified.iloc[0:0]
+
         # Process each site
         for site_idx, site in enumerate(sites):
             h_row = comp_idx * 2 + 1
             t_row = comp_idx * 2 + 2
             col = site_idx + 1
 
-            site_data = compound_data[compound_data['site_id'] == site].copy()
-            site_analysis = classified[classified['site_id'] == site]
+            site_data = data_by_site.get(site)
+            site_analysis = classified_by_site.get(site, empty_analysis)
 
-            if len(site_data) < 2:
+            if site_data is None or len(site_data) < 2:
                 continue
 
             # Plot data points with load-informed sizing
@@ -505,33 +678,35 @@ def create_multi_compound_hysteresis_plot(data: pd.DataFrame,
                                        h_row, col, show_legend=(comp_idx == 0 and site_idx == 0))
 
             # Calculate thicknesses
-            hi_values = site_analysis[hi_col].values
+            # Hoist the needed columns to arrays once and emit the segments
+            # as NaN-separated batched traces grouped by style. float32
+            # suffices for on-screen precision and halves the payload.
+            start_flow = site_analysis['start_flow'].to_numpy(dtype=np.float32)
+            end_flow = site_analysis['end_flow'].to_numpy(dtype=np.float32)
+            start_conc = site_analysis['start_conc'].to_numpy(dtype=np.float32)
+            end_conc = site_analysis['end_conc'].to_numpy(dtype=np.float32)
+            start_date = site_analysis['start_date'].to_numpy()
+            end_date = site_analysis['end_date'].to_numpy()
+            phases = site_analysis['geochemical_phase'].to_numpy()
+            hi_values = site_analysis[hi_col].to_numpy(dtype=np.float32)
             thicknesses = calculate_log_thickness(hi_values)
             thicknesses[np.isnan(thicknesses)] = 1.0
+            # Resolve every dash style in one vectorized pass
+            dashes = get_line_styles_from_hi_class(site_analysis, line_style_method)
 
-            # Plot hysteresis segments
-            for i, seg in site_analysis.iterrows():
-                thickness = thicknesses[i - site_analysis.index[0]]
-
-                # Hysteresis loop
-                _plot_hysteresis_segment(fig, seg, thickness, line_style_method, hi_col, h_row, col)
-
-                # Timeline
-                dash = get_line_style_from_hi_class(seg, method=line_style_method)
-                fig.add_trace(
-                    go.Scatter(
-                        x=[seg['start_date'], seg['end_date']],
-                        y=[seg['start_conc'], seg['end_conc']],
-                        mode='lines',
-                        line=dict(
-                            color=phase_colors.get(seg['geochemical_phase'], 'gray'),
-                            width=2,
-                            dash=dash
-                        ),
-                        showlegend=False
-                    ),
-                    row=t_row, col=col
-                )
+            hovertexts = [f"<b>{phase}</b><br>HI: {hi:.3f}"
+                          for phase, hi in zip(phases, hi_values)]
+
+            # Hysteresis loops
+            _add_segment_batches(fig, start_flow, end_flow,
+                                 start_conc, end_conc,
+                                 phases, dashes, thicknesses,
+                                 row=h_row, col=col, hovertexts=hovertexts)
+
+            # Timeline
+            _add_segment_batches(fig, start_date, end_date,
+                                 start_conc, end_conc,
+                                 phases, dashes, 2, row=t_row, col=col)
 
             # Update axes with compound-specific ranges
             fig.update_xaxes(type='log', range=[np.log10(qxmin), np.log10(qxmax)], row=h_row, col=col)
@@ -579,12 +754,14 @@ def _add_diagnostic_scatter(fig: go.Figure,
                              size: int = 8,
                              show_legend: bool = True) -> None:
       """Helper to add diagnostic scatter trace (avoid duplication)."""
+      import plotly.graph_objects as go
 
       # Prepare custom data for hover (site_id, compound, start_date, segment_id)
       customdata = phase_data[['site_id', 'compound', 'start_date', 'segment_id']].values
 
+      # Scattergl: WebGL markers scale to far larger point counts than SVG
       fig.add_trace(
-          go.Scatter(
+          go.Scattergl(
               x=phase_data[x_col],
               y=phase_data[y_col],
               mode='markers',
@@ -615,7 +792,8 @@ def _add_diagnostic_scatter(fig: go.Figure,
 def create_diagnostic_plot(results: pd.DataFrame,
                           manual_labels: Optional[pd.DataFrame] = None,
                           title: str = "Geochemical Phase Classification Diagnostic",
-                          show_unlabeled: bool = True) -> go.Figure:
+                          show_unlabeled: bool = True,
+                          label_tolerance: Optional[str] = None) -> go.Figure:
     """
     Create two-panel diagnostic plot for phase classification.
 
@@ -632,12 +810,19 @@ def create_diagnostic_plot(results: pd.DataFrame,
         Plot title
     show_unlabeled : bool
         Show segments without manual labels (faded)
+    label_tolerance : str or pd.Timedelta, optional
+        When given (e.g. '1D'), labels are matched to the nearest segment
+        end_date within this tolerance via pd.merge_asof instead of exact
+        date equality — useful when label dates and sampling dates are
+        recorded at slightly different resolutions.
 
     Returns
     -------
     go.Figure
         Two-panel diagnostic plot
     """
+    from plotly.subplots import make_subplots
+
     fig = make_subplots(
         rows=1, cols=2,
         subplot_titles=['CVc/CVq vs C-Q Slope', 'ΔQ vs ΔC Phase Space'],
@@ -645,16 +830,37 @@ def create_diagnostic_plot(results: pd.DataFrame,
     )
 
     # Prepare data
-    if manual_labels is not None:
-        merged = pd.merge(
-            results,
-            manual_labels[['site_id', 'date', 'manual_phase']],
-            left_on=['site_id', 'end_date'],
-            right_on=['site_id', 'date'],
-            how='left'
-        )
-        labeled = merged[merged['manual_phase'].notna()].copy()
-        unlabeled = merged[merged['manual_phase'].isna()].copy()
+    if manual_labels is not None and label_tolerance is not None:
+        # Nearest-date matching: one linear scan over the pre-sorted
+        # timestamps per site instead of a multi-key hash merge
+        merged = pd.merge_asof(
+            results.sort_values('end_date'),
+            manual_labels[['site_id', 'date', 'manual_phase']]
+                .sort_values('date'),
+            left_on='end_date', right_on='date',
+            by='site_id',
+            direction='nearest',
+            tolerance=pd.Timedelta(label_tolerance),
+        ).drop(columns='date')
+        has_label = merged['manual_phase'].notna()
+        labeled = merged[has_label].copy()
+        unlabeled = merged[~has_label].copy()
+        labeled['correct'] = labeled['geochemical_phase'] == labeled['manual_phase']
+    elif manual_labels is not None:
+        # Hash-map lookup on (site_id, date) instead of a multi-key merge:
+        # the label table is small, so one dict build plus an O(N) lookup
+        # pass beats allocating and sorting a merged frame
+        lookup = dict(zip(zip(manual_labels['site_id'],
+                              manual_labels['date']),
+                          manual_labels['manual_phase']))
+        merged = results.copy()
+        merged['manual_phase'] = [
+            lookup.get(key)
+            for key in zip(merged['site_id'], merged['end_date'])
+        ]
+        has_label = merged['manual_phase'].notna()
+        labeled = merged[has_label].copy()
+        unlabeled = merged[~has_label].copy()
         labeled['correct'] = labeled['geochemical_phase'] == labeled['manual_phase']
     else:
         labeled = results.copy()
@@ -743,28 +949,42 @@ def create_phase_sequence_plot(results: pd.DataFrame,
     go.Figure
         Timeline plot with phase colors
     """
+    import plotly.graph_objects as go
+
     fig = go.Figure()
 
+    # One groupby pass instead of a boolean-mask scan per site
+    by_site = dict(iter(results.groupby('site_id', sort=False)))
+
     for site in sites:
-        site_data = results[results['site_id'] == site].sort_values('start_date')
+        site_data = by_site.get(site)
+        if site_data is None:
+            continue
+        site_data = site_data.sort_values('start_date')
 
-        for _, row in site_data.iterrows():
-            phase = row[gccol]
-            fig.add_trace(
-                go.Scatter(
-                    x=[row['start_date'], row['end_date']],
-                    y=[site, site],
-                    mode='lines',
-                    line=dict(color=phase_colors.get(phase, 'gray'), width=15),
-                    showlegend=False,
-                    hovertemplate=(
-                        f"<b>{phase_names.get(phase, phase)}</b><br>"
-                        f"Start: {row['start_date']}<br>"
-                        f"End: {row['end_date']}<br>"
-                        f"Confidence: {row.get('phase_confidence', 0):.2f}<extra></extra>"
-                    )
-                )
-            )
+        start_date = site_data['start_date'].to_numpy()
+        end_date = site_data['end_date'].to_numpy()
+        phases = site_data[gccol].to_numpy()
+        if 'phase_confidence' in site_data.columns:
+            confidences = site_data['phase_confidence'].to_numpy()
+        else:
+            confidences = np.zeros(len(site_data))
+
+        hovertexts = [
+            f"<b>{phase_names.get(phase, phase)}</b><br>"
+            f"Start: {start}<br>"
+            f"End: {end}<br>"
+            f"Confidence: {conf:.2f}"
+            for phase, start, end, conf
+            in zip(phases, start_date, end_date, confidences)
+        ]
+
+        # One NaN-separated trace per phase color instead of one per segment
+        _add_segment_batches(fig, start_date, end_date,
+                             np.full(len(site_data), site, dtype=object),
+                             np.full(len(site_data), site, dtype=object),
+                             phases, np.full(len(site_data), _DASH[0], dtype=object),
+                             15, hovertexts=hovertexts)
 
     # Add legend
     _add_phase_legend(fig)
@@ -806,6 +1026,8 @@ def create_hysteresis_timeline(results: pd.DataFrame,
     go.Figure
         Timeline plot
     """
+    import plotly.graph_objects as go
+
     if len(results) == 0:
         fig = go.Figure()
         fig.add_annotation(text="No data available", x=0.5, y=0.5)
@@ -814,32 +1036,42 @@ def create_hysteresis_timeline(results: pd.DataFrame,
     fig = go.Figure()
     hi_col = f'window_HI_{hi_method}'
 
-    for site in sites:
-        site_df = results[results['site_id'] == site]
-
-        for _, seg in site_df.iterrows():
-            hi_val = seg.get(hi_col, 0)
-            dash = 'solid' if hi_val > 0.1 else ('2px 1px' if hi_val < -0.1 else '1px 1px')
+    # One groupby pass instead of a boolean-mask scan per site
+    by_site = dict(iter(results.groupby('site_id', sort=False)))
 
-            fig.add_trace(
-                go.Scatter(
-                    x=[seg['start_date'], seg['end_date']],
-                    y=[site, site],
-                    mode='lines',
-                    line=dict(
-                        color=phase_colors.get(seg['geochemical_phase'], 'gray'),
-                        width=20,
-                        dash=dash
-                    ),
-                    showlegend=False,
-                    hovertemplate=(
-                        f"<b>{phase_names.get(seg['geochemical_phase'], seg['geochemical_phase'])}</b><br>"
-                        f"HI: {hi_val:.3f}<br>"
-                        f"Confidence: {seg.get('phase_confidence', 0):.2f}<br>"
-                        f"Duration: {(seg['end_date'] - seg['start_date']).days} days<extra></extra>"
-                    )
-                )
-            )
+    for site in sites:
+        site_df = by_site.get(site)
+        if site_df is None:
+            continue
+        n = len(site_df)
+
+        start_date = site_df['start_date'].to_numpy()
+        end_date = site_df['end_date'].to_numpy()
+        phases = site_df['geochemical_phase'].to_numpy()
+        hi_values = (site_df[hi_col].to_numpy()
+                     if hi_col in site_df.columns else np.zeros(n))
+        confidences = (site_df['phase_confidence'].to_numpy()
+                       if 'phase_confidence' in site_df.columns
+                       else np.zeros(n))
+        durations = (end_date - start_date) // np.timedelta64(1, 'D')
+
+        dashes = np.where(hi_values > 0.1, _DASH[0],
+                          np.where(hi_values < -0.1, _DASH[1], _DASH[2]))
+
+        hovertexts = [
+            f"<b>{phase_names.get(phase, phase)}</b><br>"
+            f"HI: {hi:.3f}<br>"
+            f"Confidence: {conf:.2f}<br>"
+            f"Duration: {dur} days"
+            for phase, hi, conf, dur
+            in zip(phases, hi_values, confidences, durations)
+        ]
+
+        # One NaN-separated trace per (color, dash) instead of one per segment
+        _add_segment_batches(fig, start_date, end_date,
+                             np.full(n, site, dtype=object),
+                             np.full(n, site, dtype=object),
+                             phases, dashes, 20, hovertexts=hovertexts)
 
     # Add legend
     _add_phase_legend(fig)
@@ -885,38 +1117,54 @@ def create_hysteresis_summary_stats(results: pd.DataFrame,
         return pd.DataFrame()
 
     hi_col = f'window_HI_{hi_method}'
-    summary = []
-
-    for site in sites:
-        site_df = results[results['site_id'] == site]
-
-        if len(site_df) == 0:
-            continue
 
-        total_segments = len(site_df)
-        date_range = site_df['end_date'].max() - site_df['start_date'].min()
+    site_results = results[results['site_id'].isin(sites)].copy()
+    if len(site_results) == 0:
+        return pd.DataFrame()
 
-        for phase in site_df['geochemical_phase'].unique():
-            phase_df = site_df[site_df['geochemical_phase'] == phase]
-            durations = (phase_df['end_date'] - phase_df['start_date']).dt.total_seconds() / 86400
+    site_results['duration_days'] = (
+        site_results['end_date'] - site_results['start_date']
+    ).dt.total_seconds() / 86400
+
+    # Per-(site, phase) statistics in one Cython groupby pass instead of
+    # nested per-site/per-phase mask scans
+    summary = site_results.groupby(
+        ['site_id', 'geochemical_phase'], sort=False
+    ).agg(
+        count=('geochemical_phase', 'size'),
+        mean_duration_days=('duration_days', 'mean'),
+        total_duration_days=('duration_days', 'sum'),
+        **{
+            f'mean_hi_{hi_method}': (hi_col, 'mean'),
+            f'std_hi_{hi_method}': (hi_col, 'std'),
+        },
+        mean_confidence=('phase_confidence', 'mean'),
+    ).reset_index().rename(columns={'geochemical_phase': 'phase'})
+
+    # Site-level totals joined back onto the per-phase rows
+    site_totals = site_results.groupby('site_id', sort=False).agg(
+        total_segments=('geochemical_phase', 'size'),
+        first_start=('start_date', 'min'),
+        last_end=('end_date', 'max'),
+    )
+    site_totals['monitoring_days'] = \
+        (site_totals['last_end'] - site_totals['first_start']).dt.days
+    summary = summary.merge(
+        site_totals[['total_segments', 'monitoring_days']],
+        left_on='site_id', right_index=True
+    )
 
-            summary.append({
-                'site_id': site,
-                'compound': ccol,
-                'phase': phase,
-                'phase_name': phase_names.get(phase, phase),
-                'count': len(phase_df),
-                'percentage': len(phase_df) / total_segments * 100,
-                'mean_duration_days': durations.mean(),
-                'total_duration_days': durations.sum(),
-                f'mean_hi_{hi_method}': phase_df[hi_col].mean(),
-                f'std_hi_{hi_method}': phase_df[hi_col].std(),
-                'mean_confidence': phase_df['phase_confidence'].mean(),
-                'monitoring_days': date_range.days,
-                'total_segments': total_segments
-            })
+    summary['compound'] = ccol
+    summary['phase_name'] = summary['phase'].map(phase_names) \
+        .fillna(summary['phase'])
+    summary['percentage'] = summary['count'] / summary['total_segments'] * 100
 
-    return pd.DataFrame(summary)
+    return summary[[
+        'site_id', 'compound', 'phase', 'phase_name', 'count', 'percentage',
+        'mean_duration_days', 'total_duration_days',
+        f'mean_hi_{hi_method}', f'std_hi_{hi_method}', 'mean_confidence',
+        'monitoring_days', 'total_segments'
+    ]]
 
 
 # =============================================================================
@@ -928,6 +1176,7 @@ __all__ = [
     'phase_names',
     'hyphase_colors',
     'get_line_style_from_hi_class',
+    'get_line_styles_from_hi_class',
     'calculate_log_thickness',
     'create_hysteresis_plot',
     'create_multi_compound_hysteresis_plot',
@@ -18,9 +18,6 @@ and concentration (C) data for hydrochemical analysis.
 
 import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
-from sklearn.preprocessing import MinMaxScaler
-from scipy.signal import find_peaks
 
 # Optional intersection libraries
 try:
@@ -35,34 +32,101 @@ try:
 except ImportError:
     HAS_PPI = False
 
+# np.trapz was renamed to np.trapezoid in numpy 2.0
+_trapezoid = getattr(np, 'trapezoid', getattr(np, 'trapz', None))
 
-def calculate_harp_metrics(df_obs, time_col='Etime', discharge_col='Q', concentration_col='C', intersection_method='auto'):
+
+def _local_maxima(x):
     """
-    Calculate HARP metrics from discharge and concentration time series.
+    Indices i with x[i-1] < x[i] > x[i+1] (strict interior local maxima).
 
-    Parameters
-    ----------
-    df_obs : pd.DataFrame
-        Observed data with time, discharge, and concentration columns
-    time_col, discharge_col, concentration_col : str
-        Column names for time, discharge, and concentration
-    intersection_method : str, default 'auto'
-        'auto', 'shapely', 'bentley-ottmann', or 'simple'
+    Covers what scipy's find_peaks was used for here; the generic plateau
+    and prominence machinery is not needed on the interpolated series.
+    """
+    x = np.asarray(x)
+    if x.size < 3:
+        return np.empty(0, dtype=np.intp)
+    mid = x[1:-1]
+    return np.flatnonzero((mid > x[:-2]) & (mid > x[2:])) + 1
 
-    Returns
-    -------
-    metric_df : pd.DataFrame
-        HARP metrics:
-        - area: Total hysteresis area (magnitude) with sign of dominant portion
-                Positive = diluting, Negative = enriching
-        - residual: Change in scaled concentration (end - start)
-                    Positive = enriching, Negative = diluting
-        - area_lower/area_upper: Areas of lower/upper portions (if intersection found)
-        - peak_Q/peak_C: Scaled peak timings (0-1)
-        - peaktime_Q/peaktime_C: Absolute peak timings (days)
-        - radius_equiv: Equivalent circle radius
-    df_all : pd.DataFrame
-        Processed data with scaled values and phase information
+
+# Fixed label vocabularies for the switchpoint/phase Categorical columns
+# ('X' marks the limb intersection found by calculate_harp_metrics)
+_SWITCH_CATS = ('', 'lQ', 'gQ', 'lC', 'gC', 'X')
+_PHASE_CATS = ('rising', 'falling')
+
+
+def _interp_gaps(xs, y):
+    """Fill NaN gaps of one limb sampled on the shared QS grid; NaN before
+    the limb starts, clamped to the last value after it ends (matching
+    forward filling)."""
+    valid = ~np.isnan(y)
+    if not valid.any():
+        return y
+    out = np.interp(xs, xs[valid], y[valid])
+    out[xs < xs[valid.argmax()]] = np.nan
+    return out
+
+
+def _build_limbs(qs, cs, rising_mask, falling_mask):
+    """
+    Build the rising/falling limb table (mean CS per QS value).
+
+    One sort over all QS values drives both per-limb segmented means
+    (phase-weighted reduceat sums), then each limb is sampled on the
+    shared unique-QS grid with ``np.interp`` (column 0 = rising,
+    1 = falling). Gaps are interpolated linearly in QS.
+    """
+    sel = rising_mask | falling_mask
+    k = qs[sel]
+    v = cs[sel]
+    r = rising_mask[sel].astype(np.float64)
+    if k.size == 0:
+        return pd.DataFrame({0: k, 1: k}, index=k)
+
+    if not np.all(np.diff(k) >= 0):
+        # Hydrograph limbs are often already monotone in QS; a linear
+        # check then replaces the sort entirely
+        order = np.argsort(k, kind='stable')
+        k = k[order]
+        v = v[order]
+        r = r[order]
+
+    first = np.flatnonzero(np.r_[True, k[1:] != k[:-1]])
+    uniq = k[first]
+    rise_cnt = np.add.reduceat(r, first)
+    fall_cnt = np.add.reduceat(1.0 - r, first)
+    rise_sum = np.add.reduceat(v * r, first)
+    fall_sum = np.add.reduceat(v * (1.0 - r), first)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rise_mean = np.where(rise_cnt > 0, rise_sum / np.maximum(rise_cnt, 1), np.nan)
+        fall_mean = np.where(fall_cnt > 0, fall_sum / np.maximum(fall_cnt, 1), np.nan)
+
+    return pd.DataFrame(
+        {0: _interp_gaps(uniq, rise_mean),
+         1: _interp_gaps(uniq, fall_mean)},
+        index=uniq,
+    )
+
+
+def _limb_area(limbs):
+    """Signed area between rising and falling limb (trapezoidal rule),
+    skipping QS values where either limb is undefined."""
+    x = limbs.index.to_numpy()
+    d = limbs[0].to_numpy() - limbs[1].to_numpy()
+    valid = ~np.isnan(d)
+    if valid.sum() < 2:
+        return 0.0
+    return _trapezoid(d[valid], x[valid])
+
+
+def _harp_scalars(df_obs, time_col='Etime', discharge_col='Q', concentration_col='C', intersection_method='auto', resample=True):
+    """
+    Core HARP computation.
+
+    Returns a plain dict of metric scalars plus the processed frame, so
+    batch callers can defer DataFrame construction to a single stacked
+    build; see calculate_harp_metrics for the metric descriptions.
     """
     df_all = df_obs[[time_col, discharge_col, concentration_col]].copy()
     df_all.columns = ['Etime', 'Q', 'C']  # Rename to standard names
@@ -73,36 +137,58 @@ def calculate_harp_metrics(df_obs, time_col='Etime', discharge_col='Q', concentr
     else:
         df_all.index = df_all['Etime'] - df_all['Etime'].iloc[0]
 
-    # Resample and interpolate
-    df_all = df_all.resample('1h').first().interpolate(method='linear', limit=None, limit_direction='forward')
+    # Resample and interpolate; complete already-hourly data passes through
+    # unchanged (unlike lloyd/zuecco there is no upfront dropna here, so
+    # frames with NaNs must still take the interpolation path).
+    # Trim leading/trailing all-NaN runs first: forward interpolation cannot
+    # fill them anyway, so there is no point scanning them.
+    dt = np.diff(df_all.index.total_seconds().to_numpy())
+    already_hourly = dt.size > 0 and (dt == 3600.0).all() and not df_all.isna().any().any()
+    if resample and not already_hourly:
+        df_all = df_all.resample('1h').first()
+        df_all = df_all.loc[df_all.first_valid_index():df_all.last_valid_index()]
+        df_all = df_all.interpolate(method='linear', limit=None, limit_direction='forward')
 
     # Create numeric Etime from index for scaling
     df_all['Etime'] = df_all.index.total_seconds() / 86400.0  # Convert to days
 
-    # Min-max scaling
-    df_all[['EtimeS', 'QS', 'CS']] = MinMaxScaler().fit_transform(df_all[['Etime', 'Q', 'C']])
-
-    # Find peaks and mark switchpoints
-    df_all['switchpointsQ'] = ''
-    df_all['switchpointsC'] = ''
-    df_all.loc[df_all.index[find_peaks(df_all['Q'])[0]], 'switchpointsQ'] = 'lQ'
-    df_all.loc[df_all.index[df_all['Q'].argmax()], 'switchpointsQ'] = 'gQ'
-    df_all.loc[df_all.index[find_peaks(df_all['C'])[0]], 'switchpointsC'] = 'lC'
-    df_all.loc[df_all.index[df_all['C'].argmax()], 'switchpointsC'] = 'gC'
-
-    # Define phases based on discharge
-    df_all['Qphase'] = 'rising'
-    df_all.loc[df_all.index[df_all['Q'].argmax()]:, 'Qphase'] = 'falling'
-
-    df_all['Cphase'] = 'rising'
-    df_all.loc[df_all.index[df_all['C'].argmax()]:, 'Cphase'] = 'falling'
-
-    # Create limbs using pandas approach (handle duplicates with groupby().mean())
-    rising_limb = df_all.loc[df_all.Qphase == 'rising', ['QS', 'CS']].groupby('QS').mean()['CS']
-    falling_limb = df_all.loc[df_all.Qphase == 'falling', ['QS', 'CS']].groupby('QS').mean()['CS']
-
-    limbs = pd.concat([rising_limb, falling_limb], axis=1, sort=True).interpolate(method='linear')
-    limbs.columns = [0, 1]  # Use integer column names for compatibility
+    # Min-max scaling (constant columns scale to zero, like MinMaxScaler)
+    arr = df_all[['Etime', 'Q', 'C']].to_numpy()
+    mn = arr.min(axis=0)
+    rng = arr.max(axis=0) - mn
+    rng[rng == 0] = 1.0
+    df_all[['EtimeS', 'QS', 'CS']] = (arr - mn) / rng
+
+    # Find peaks and mark switchpoints. Labels are filled positionally into
+    # numpy arrays and stored as Categorical columns (int8 codes instead of
+    # object strings), which keeps the string API for callers.
+    n = len(df_all)
+    q_vals = df_all['Q'].to_numpy()
+    c_vals = df_all['C'].to_numpy()
+    qmax_i = int(q_vals.argmax())
+    cmax_i = int(c_vals.argmax())
+
+    switch_q = np.full(n, '', dtype=object)
+    switch_c = np.full(n, '', dtype=object)
+    switch_q[_local_maxima(q_vals)] = 'lQ'
+    switch_q[qmax_i] = 'gQ'
+    switch_c[_local_maxima(c_vals)] = 'lC'
+    switch_c[cmax_i] = 'gC'
+    df_all['switchpointsQ'] = pd.Categorical(switch_q, categories=_SWITCH_CATS)
+    df_all['switchpointsC'] = pd.Categorical(switch_c, categories=_SWITCH_CATS)
+
+    # Define phases based on discharge (peak row itself counts as falling)
+    rising = np.arange(n) < qmax_i
+    df_all['Qphase'] = pd.Categorical(
+        np.where(rising, 'rising', 'falling'), categories=_PHASE_CATS)
+    df_all['Cphase'] = pd.Categorical(
+        np.where(np.arange(n) < cmax_i, 'rising', 'falling'), categories=_PHASE_CATS)
+
+    # Create limbs (duplicates within a limb are averaged per QS value)
+    qs = df_all['QS'].to_numpy()
+    cs = df_all['CS'].to_numpy()
+
+    limbs = _build_limbs(qs, cs, rising, ~rising)
 
     # Find intersection point
     xQS = _find_intersection(limbs, method=intersection_method)
@@ -113,19 +199,14 @@ def calculate_harp_metrics(df_obs, time_col='Etime', discharge_col='Q', concentr
         df_all.loc[xID, 'switchpointsQ'] = 'X'
         df_all.loc[xID, 'switchpointsC'] = 'X'
 
-        # Calculate areas for lower and upper portions (preserve signs)
-        rising1 = df_all.loc[(df_all.QS <= xQS) & (df_all.Qphase == 'rising'), ['QS', 'CS']].groupby('QS').mean()['CS']
-        falling1 = df_all.loc[(df_all.QS <= xQS) & (df_all.Qphase == 'falling'), ['QS', 'CS']].groupby('QS').mean()['CS']
-        limbs1 = pd.concat([rising1, falling1], axis=1, sort=True).interpolate(method='linear')
-        limbs1.columns = [0, 1]
-
-        rising2 = df_all.loc[(df_all.QS > xQS) & (df_all.Qphase == 'rising'), ['QS', 'CS']].groupby('QS').mean()['CS']
-        falling2 = df_all.loc[(df_all.QS > xQS) & (df_all.Qphase == 'falling'), ['QS', 'CS']].groupby('QS').mean()['CS']
-        limbs2 = pd.concat([rising2, falling2], axis=1, sort=True).interpolate(method='linear')
-        limbs2.columns = [0, 1]
+        # Calculate areas for lower and upper portions (preserve signs);
+        # limbs already holds both limbs aligned per QS, so just split it
+        # at the intersection instead of rebuilding from the raw points
+        limbs1 = limbs.loc[limbs.index <= xQS]
+        limbs2 = limbs.loc[limbs.index > xQS]
 
-        area1 = ((limbs1[0] - limbs1[1]) * limbs1.index.diff()).sum()
-        area2 = ((limbs2[0] - limbs2[1]) * limbs2.index.diff()).sum()
+        area1 = _limb_area(limbs1)
+        area2 = _limb_area(limbs2)
 
         # Total area: magnitude sum with sign of larger portion
         total_area = abs(area1) + abs(area2)
@@ -133,53 +214,152 @@ def calculate_harp_metrics(df_obs, time_col='Etime', discharge_col='Q', concentr
         area = area_sign * total_area
     else:
         # No intersection found - calculate total area
-        area = ((limbs[0] - limbs[1]) * limbs.index.diff()).sum()
+        area = _limb_area(limbs)
         area1 = np.nan
         area2 = np.nan
 
     # Residual: change in concentration from start to finish
-    residual = df_all['CS'].iloc[-1] - df_all['CS'].iloc[0]
+    residual = cs[-1] - cs[0]
 
     # Calculate equivalent circle radius
     radius = np.sqrt(abs(area) / np.pi)
 
-    # Extract peak timing metrics
-    peak_q_time = df_all.loc[df_all.switchpointsQ == 'gQ'].index[0]
-    peak_c_time = df_all.loc[df_all.switchpointsC == 'gC'].index[0]
+    # Extract peak timing metrics from the cached argmax positions
+    peak_q_time = df_all.index[qmax_i]
+    peak_c_time = df_all.index[cmax_i]
+    peaktime_q = peak_q_time.days + peak_q_time.seconds / 86400.0
+    peaktime_c = peak_c_time.days + peak_c_time.seconds / 86400.0
+    etime_s = df_all['EtimeS'].to_numpy()
+    peak_q = etime_s[qmax_i]
+    peak_c = etime_s[cmax_i]
+
+    # Peaks at t=0 divide by zero; keep the silent inf/nan results the
+    # former Series division produced
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scalars = {
+            'area': area,
+            'residual': residual,
+            'area_lower': area1,
+            'area_upper': area2,
+            'peak_Q': peak_q,
+            'peak_C': peak_c,
+            'peaktime_Q': peaktime_q,
+            'peaktime_C': peaktime_c,
+            'radius_equiv': radius,
+            'dQpeak': peak_q / peaktime_q,
+            'dCpeak': peak_c / peaktime_c,
+        }
+
+    return scalars, df_all
+
+
+def calculate_harp_metrics(df_obs, time_col='Etime', discharge_col='Q', concentration_col='C', intersection_method='auto', resample=True):
+    """
+    Calculate HARP metrics from discharge and concentration time series.
 
-    metric_df = pd.DataFrame({
-        'area': [area],
-        'residual': [residual],
-        'area_lower': [area1],
-        'area_upper': [area2],
-        'peak_Q': [df_all.loc[df_all.switchpointsQ == 'gQ', 'EtimeS'].values[0]],
-        'peak_C': [df_all.loc[df_all.switchpointsC == 'gC', 'EtimeS'].values[0]],
-        'peaktime_Q': [peak_q_time.days + peak_q_time.seconds / 86400.0],
-        'peaktime_C': [peak_c_time.days + peak_c_time.seconds / 86400.0],
-        'radius_equiv': [radius]
-    })
-    metric_df['dQpeak'] = metric_df['peak_Q']/metric_df['peaktime_Q']
-    metric_df['dCpeak'] = metric_df['peak_C']/metric_df['peaktime_C']
+    Parameters
+    ----------
+    df_obs : pd.DataFrame
+        Observed data with time, discharge, and concentration columns
+    time_col, discharge_col, concentration_col : str
+        Column names for time, discharge, and concentration
+    intersection_method : str, default 'auto'
+        'auto', 'analytic', 'shapely', 'bentley-ottmann', or 'simple'
+        ('auto' uses the analytic segment-crossing test)
+    resample : bool, default True
+        Resample to a regular hourly grid. Data already sampled exactly
+        hourly passes through unchanged; set False to skip resampling for
+        data prepared externally.
+
+    Returns
+    -------
+    metric_df : pd.DataFrame
+        HARP metrics:
+        - area: Total hysteresis area (magnitude) with sign of dominant portion
+                Positive = diluting, Negative = enriching
+        - residual: Change in scaled concentration (end - start)
+                    Positive = enriching, Negative = diluting
+        - area_lower/area_upper: Areas of lower/upper portions (if intersection found)
+        - peak_Q/peak_C: Scaled peak timings (0-1)
+        - peaktime_Q/peaktime_C: Absolute peak timings (days)
+        - radius_equiv: Equivalent circle radius
+    df_all : pd.DataFrame
+        Processed data with scaled values and phase information
+    """
+    scalars, df_all = _harp_scalars(df_obs, time_col, discharge_col,
+                                    concentration_col, intersection_method,
+                                    resample)
+    return pd.DataFrame([scalars]), df_all
+
+
+def _harp_batch_worker(df_obs, kwargs):
+    """Top-level worker so ProcessPoolExecutor can pickle the batch call."""
+    return _harp_scalars(df_obs, **kwargs)[0]
 
-    return metric_df, df_all
+
+def calculate_harp_metrics_batch(events, n_jobs=None, **kwargs):
+    """
+    Run calculate_harp_metrics over many storm events.
+
+    Parameters
+    ----------
+    events : sequence of pd.DataFrame
+        One observed-data frame per event, as accepted by calculate_harp_metrics
+    n_jobs : int, optional
+        Number of worker processes; None or 1 runs serially, -1 uses all cores
+    **kwargs
+        Forwarded to calculate_harp_metrics (column names, intersection method)
+
+    Returns
+    -------
+    pd.DataFrame
+        Stacked HARP metrics, one row per event in input order. The processed
+        per-event frames are not returned; call calculate_harp_metrics
+        directly for events that need plotting.
+    """
+    events = list(events)
+    if not events:
+        return pd.DataFrame()
+
+    if n_jobs in (None, 1) or len(events) < 2:
+        rows = [_harp_scalars(ev, **kwargs)[0] for ev in events]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        from functools import partial
+        with ProcessPoolExecutor(max_workers=None if n_jobs == -1 else n_jobs) as pool:
+            rows = list(pool.map(partial(_harp_batch_worker, kwargs=kwargs), events))
+
+    return pd.DataFrame.from_records(rows)
 
 
 def _find_intersection(limbs, method='auto'):
     """Find intersection between rising and falling limbs."""
-    # Auto-select method
+    # Auto-select method. Both limbs are sampled on the same sorted QS index,
+    # so crossings can be located analytically per segment pair without a
+    # geometry library; 'auto' therefore prefers the analytic path.
     if method == 'auto':
-        if HAS_SHAPELY:
-            method = 'shapely'
-        elif HAS_PPI:
-            method = 'bentley-ottmann'
-        else:
-            method = 'simple'
+        method = 'analytic'
 
     limbs_clean = limbs.dropna()
     if len(limbs_clean) < 2:
         return None
 
-    if method == 'shapely':
+    if method == 'analytic':
+        # Where the limb difference changes sign, both curves are linear on
+        # the same x-interval, so the crossing is the zero of the linearly
+        # interpolated difference
+        x = limbs_clean.index.to_numpy(dtype=float)
+        d = (limbs_clean[0] - limbs_clean[1]).to_numpy(dtype=float)
+        k = np.where(np.diff(np.signbit(d)))[0]
+        if len(k) == 0:
+            return None
+        k = k[0]  # first crossing
+        denom = d[k + 1] - d[k]
+        if denom == 0:
+            return x[k]
+        return x[k] + (x[k + 1] - x[k]) * (-d[k]) / denom
+
+    elif method == 'shapely':
         if not HAS_SHAPELY:
             raise ImportError("shapely not available. Install: pip install shapely")
 
@@ -212,35 +392,62 @@ def _find_intersection(limbs, method='auto'):
 
     elif method == 'simple':
         # Find where limbs cross by checking sign changes
-        diff = limbs_clean[0] - limbs_clean[1]
-        sign_changes = np.where(np.diff(np.sign(diff)))[0]
-        if len(sign_changes) > 0:
+        d = (limbs_clean[0] - limbs_clean[1]).to_numpy()
+        signs = np.sign(d)
+        crossing = signs[:-1] != signs[1:]
+        if crossing.any():
             # Return first crossing point
-            return limbs_clean.index[sign_changes[0]]
+            return limbs_clean.index[int(crossing.argmax())]
         return None
 
     else:
         raise ValueError(f"Unknown method: {method}")
 
 
+# Unit circle at the default resolution, computed once at import so each
+# draw_circle call is a scale-and-shift instead of 200 transcendentals
+_UNIT_COS = np.cos(np.linspace(0, 2 * np.pi, 100))
+_UNIT_SIN = np.sin(np.linspace(0, 2 * np.pi, 100))
+
+
 def draw_circle(radius, center_x=0.5, center_y=0.5, n_points=100):
     '''Generate circle coordinates for visualization.
     radius :: equiv radius from harp calculation
     center_x/center_y :: optional to center the circle in the plot
     npoints :: points on the circle
-    
+
     returns :: x, y as coordinates'''
+    if n_points == 100:
+        return center_x + radius * _UNIT_COS, center_y + radius * _UNIT_SIN
     t = np.linspace(0, 2 * np.pi, n_points)
     x = center_x + radius * np.cos(t)
     y = center_y + radius * np.sin(t)
     return x, y
 
+
+def draw_circles(radii, center_x=0.5, center_y=0.5, n_points=100):
+    '''Generate circle coordinates for many radii at once via broadcasting.
+    radii :: array-like of equiv radii, one circle per entry
+    center_x/center_y :: optional to center the circles in the plot
+    npoints :: points on each circle
+
+    returns :: x, y as (len(radii), n_points) coordinate arrays'''
+    radii = np.asarray(radii, dtype=float)[:, None]
+    if n_points == 100:
+        cos_t, sin_t = _UNIT_COS, _UNIT_SIN
+    else:
+        t = np.linspace(0, 2 * np.pi, n_points)
+        cos_t, sin_t = np.cos(t), np.sin(t)
+    return center_x + radii * cos_t, center_y + radii * sin_t
+
 def harp_plot(df_processed,metrics):
     '''Visualize hysteresis loop
     df_processed :: df_all output from calculate_harp_metrics
     metrics :: metrics output from calculate_harp_metrics
     returns :: fig -> can be shown, saved, or further be processed
     '''
+    import plotly.graph_objects as go
+
     fig = go.Figure()
 
     # Plot data colored by time
@@ -254,7 +461,7 @@ def harp_plot(df_processed,metrics):
         name=f'Equiv. area (r={metrics["radius_equiv"].values[0]:.3f})'))
 
     # Mark intersection point if exists
-    if 'X' in df_processed['switchpointsQ'].values:
+    if (df_processed['switchpointsQ'] == 'X').any():
         x_point = df_processed.loc[df_processed['switchpointsQ'] == 'X', 'QS']
         y_point = df_processed.loc[df_processed['switchpointsC'] == 'X', 'CS']
         fig.add_trace(go.Scatter(x=x_point, y=y_point,mode='markers',
@@ -25,38 +25,22 @@ FIXED: Column indexing bug that caused KeyError when accessing limbs DataFrame
 
 import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
-from scipy.signal import find_peaks
-from sklearn.preprocessing import MinMaxScaler
 import warnings
 
-def calculate_lawlerlloyd_metrics(df_obs, time_col='Etime', discharge_col='Q', concentration_col='C'):
-    """
-    Calculate Lawler-Lloyd hysteresis index.
+from .harp import _build_limbs, _local_maxima
 
-    Parameters
-    ----------
-    df_obs : pd.DataFrame
-        Observed data with time, discharge, and concentration columns
-    time_col, discharge_col, concentration_col : str
-        Column names for time, discharge, and concentration
+# Fixed label vocabularies for the switchpoint/phase Categorical columns
+_SWITCH_CATS = ('', 'lQ', 'lC', 'gQ', 'gC')
+_PHASE_CATS = ('rising', 'falling')
 
-    Returns
-    -------
-    metrics_df : pd.DataFrame
-        Lawler-Lloyd metrics:
-        - mean_HI: Mean hysteresis index across percentiles
-        - median_HI: Median hysteresis index
-        - HI_range: Range of HI values (max - min)
-        - mean_abs_HI: Mean of absolute HI values
-    df_all : pd.DataFrame
-        Processed time series data with:
-        - Q, C: Original discharge and concentration values
-        - QS, CS: Normalized (0-1) discharge and concentration
-        - Qphase, Cphase: Rising/falling phase indicators
-        - switchpoints: Peak markers (gQ, gC, lQ, lC)
-        Plus HI percentile data stored in attrs:
-        - attrs['HI_percentiles']: DataFrame with Hi, RLi, FLi at each QS percentile
+def _lloyd_scalars(df_obs, time_col='Etime', discharge_col='Q', concentration_col='C', resample=True, methods=('lloyd', 'lawler')):
+    """
+    Core Lawler-Lloyd computation.
+
+    Returns a plain dict of metric scalars plus the HI percentile table and
+    the processed frame, so batch callers can defer DataFrame construction
+    to a single stacked build; see calculate_lawlerlloyd_metrics for the
+    metric descriptions.
     """
     # Validate input
     if ((discharge_col not in df_obs.columns) | (concentration_col not in df_obs.columns) | (time_col not in df_obs.columns)):
@@ -76,77 +60,86 @@ def calculate_lawlerlloyd_metrics(df_obs, time_col='Etime', discharge_col='Q', c
     else:
         df_all.index = df_all['Etime'] - df_all['Etime'].iloc[0]
 
-    # Resample and interpolate
-    df_all = df_all.resample('1h').first().interpolate(method='linear', limit=None, limit_direction='forward')
+    # Resample and interpolate; already-hourly data passes through unchanged.
+    # Trim leading/trailing all-NaN runs first: forward interpolation cannot
+    # fill them anyway, so there is no point scanning them.
+    dt = np.diff(df_all.index.total_seconds().to_numpy())
+    if resample and not (dt.size > 0 and (dt == 3600.0).all()):
+        df_all = df_all.resample('1h').first()
+        df_all = df_all.loc[df_all.first_valid_index():df_all.last_valid_index()]
+        df_all = df_all.interpolate(method='linear', limit=None, limit_direction='forward')
 
     # Create numeric Etime from index for scaling
     df_all['Etime'] = df_all.index.total_seconds() / 86400.0  # Convert to days
 
-    # Min-max scaling
-    df_all[['EtimeS', 'QS', 'CS']] = MinMaxScaler().fit_transform(df_all[['Etime', 'Q', 'C']])
-
-    # Find peaks and mark switchpoints
-    df_all['switchpoints'] = ''
-    df_all.loc[df_all.index[find_peaks(df_all['Q'])[0]], 'switchpoints'] = 'lQ'
-    df_all.loc[df_all.index[find_peaks(df_all['C'])[0]], 'switchpoints'] = 'lC'
-    df_all.loc[df_all.index[df_all['Q'].argmax()], 'switchpoints'] = 'gQ'
-    df_all.loc[df_all.index[df_all['C'].argmax()], 'switchpoints'] = 'gC'
-
-    # Define phases based on discharge
-    df_all['Qphase'] = 'rising'
-    df_all.loc[df_all.index[df_all['Q'].argmax()]:, 'Qphase'] = 'falling'
-
-    df_all['Cphase'] = 'rising'
-    df_all.loc[df_all.index[df_all['C'].argmax()]:, 'Cphase'] = 'falling'
-
-    # Create limbs using original elegant pandas approach
-    # Handle duplicates by taking mean of CS values at same QS
-    rising_limb = df_all.loc[df_all.Qphase == 'rising', ['QS', 'CS']].groupby('QS').mean()['CS']
-    falling_limb = df_all.loc[df_all.Qphase == 'falling', ['QS', 'CS']].groupby('QS').mean()['CS']
-
-    limbs = pd.concat([rising_limb, falling_limb], axis=1, sort=True).interpolate(method='linear')
-    # *** CRITICAL FIX (v2.0): Explicitly set column names to integer indices ***
-    limbs.columns = [0, 1]  # Use integer column names for compatibility
+    # Min-max scaling (constant columns scale to zero, like MinMaxScaler)
+    arr = df_all[['Etime', 'Q', 'C']].to_numpy()
+    mn = arr.min(axis=0)
+    rng = arr.max(axis=0) - mn
+    rng[rng == 0] = 1.0
+    df_all[['EtimeS', 'QS', 'CS']] = (arr - mn) / rng
+
+    # Find peaks and mark switchpoints. Labels are filled positionally into a
+    # numpy array and stored as a Categorical column (int8 codes instead of
+    # object strings), which keeps the string API for callers.
+    n = len(df_all)
+    q_vals = df_all['Q'].to_numpy()
+    c_vals = df_all['C'].to_numpy()
+    qmax_i = int(q_vals.argmax())
+    cmax_i = int(c_vals.argmax())
+
+    switch = np.full(n, '', dtype=object)
+    switch[_local_maxima(q_vals)] = 'lQ'
+    switch[_local_maxima(c_vals)] = 'lC'
+    switch[qmax_i] = 'gQ'
+    switch[cmax_i] = 'gC'
+    df_all['switchpoints'] = pd.Categorical(switch, categories=_SWITCH_CATS)
+
+    # Define phases based on discharge (peak row itself counts as falling)
+    rising = np.arange(n) < qmax_i
+    df_all['Qphase'] = pd.Categorical(
+        np.where(rising, 'rising', 'falling'), categories=_PHASE_CATS)
+    df_all['Cphase'] = pd.Categorical(
+        np.where(np.arange(n) < cmax_i, 'rising', 'falling'), categories=_PHASE_CATS)
+
+    # Create limbs (duplicates are averaged per QS value within each limb)
+    # Columns are integer indices: 0 = rising, 1 = falling (v2.0 fix)
+    qs = df_all['QS'].to_numpy()
+    cs = df_all['CS'].to_numpy()
+    limbs = _build_limbs(qs, cs, rising, ~rising)
 
     # Calculate both Lawler (2006) and Lloyd (2016) HI methods at QS percentiles
     # Lawler et al. (2006) - Equations 1 & 2: Ratio-based method
     # Lloyd et al. (2016) - Equation 5: Difference-based method (normalized)
 
     percentiles = np.arange(0.1, 1.0, 0.1)
-    HI_data = pd.DataFrame(index=percentiles, columns=['HIL', 'HInew', 'RLi', 'FLi'])
 
-    for i in percentiles:
-        # Sample limbs at QS percentile VALUE i (not index position!)
-        if i in limbs.index:
-            C_rise = limbs.loc[i, 0]
-            C_fall = limbs.loc[i, 1]
-        else:
-            # Interpolate if exact percentile not in index
-            C_rise = np.interp(i, limbs.index, limbs.iloc[:, 0])
-            C_fall = np.interp(i, limbs.index, limbs.iloc[:, 1])
-
-        # Store limb values
-        HI_data.loc[i, 'RLi'] = C_rise
-        HI_data.loc[i, 'FLi'] = C_fall
+    # Sample limbs at the QS percentile VALUES (not index positions!) in one
+    # interpolation pass per limb; exact index hits reproduce direct lookups
+    xs = limbs.index.to_numpy(dtype=float)
+    C_rise = np.interp(percentiles, xs, limbs[0].to_numpy(dtype=float))
+    C_fall = np.interp(percentiles, xs, limbs[1].to_numpy(dtype=float))
 
+    with np.errstate(divide='ignore', invalid='ignore'):
         # METHOD 1: Lawler et al. (2006) - Ratio method (Eq. 1 & 2 from Paper)
-        if C_rise > C_fall:  # Clockwise
-            if C_fall == 0:
-                HI_data.loc[i, 'HIL'] = np.nan  # Undefined
-            else:
-                HI_data.loc[i, 'HIL'] = (C_rise / C_fall) - 1
-        else:  # Anticlockwise
-            if C_rise == 0:
-                HI_data.loc[i, 'HIL'] = np.nan  # Undefined
-            else:
-                HI_data.loc[i, 'HIL'] = (-1 / (C_rise / C_fall)) + 1
+        # Clockwise (C_rise > C_fall) uses the ratio minus one, anticlockwise
+        # the negative inverse plus one; a zero denominator limb is undefined
+        if 'lawler' in methods:
+            clockwise = C_rise > C_fall
+            ratio = C_rise / C_fall
+            HIL = np.where(clockwise, ratio - 1, (-1 / ratio) + 1)
+            HIL = np.where(np.where(clockwise, C_fall, C_rise) == 0, np.nan, HIL)
+        else:
+            HIL = np.full(percentiles.shape, np.nan)
 
         # METHOD 2: Lloyd et al. (2016) - Difference method (Eq. 5 from Technical Note (recommended method))
-        C_mid = max(C_rise, C_fall)
-        if C_mid == 0:
-            HI_data.loc[i, 'HInew'] = 0
-        else:
-            HI_data.loc[i, 'HInew'] = (C_rise - C_fall) / C_mid
+        C_mid = np.maximum(C_rise, C_fall)
+        HInew = np.where(C_mid == 0, 0.0, (C_rise - C_fall) / C_mid)
+
+    HI_data = pd.DataFrame(
+        {'HIL': HIL, 'HInew': HInew, 'RLi': C_rise, 'FLi': C_fall},
+        index=percentiles,
+    )
 
     # Calculate summary metrics for both methods
     # Suppress "Mean of empty slice" warnings when all values are NaN
@@ -154,24 +147,112 @@ def calculate_lawlerlloyd_metrics(df_obs, time_col='Etime', discharge_col='Q', c
         warnings.filterwarnings('ignore', message='Mean of empty slice')
         warnings.filterwarnings('ignore', category=RuntimeWarning)
 
-        metric_df = pd.DataFrame({
+        # min/median/max of each HI variant in one nan-aware percentile call
+        hil_min, hil_med, hil_max = np.nanpercentile(HIL, [0, 50, 100])
+        hinew_min, hinew_med, hinew_max = np.nanpercentile(HInew, [0, 50, 100])
+
+        scalars = {
             # Lawler method (ratio-based)
-            'mean_HIL': [HI_data['HIL'].mean()],
-            'median_HIL': [HI_data['HIL'].median()],
-            'HIL_range': [HI_data['HIL'].max() - HI_data['HIL'].min()],
+            'mean_HIL': np.nanmean(HIL),
+            'median_HIL': hil_med,
+            'HIL_range': hil_max - hil_min,
             # Lloyd new method (difference-based, recommended)
-            'mean_HInew': [HI_data['HInew'].mean()],
-            'median_HInew': [HI_data['HInew'].median()],
-            'HInew_range': [HI_data['HInew'].max() - HI_data['HInew'].min()],
-            'mean_abs_HInew': [HI_data['HInew'].abs().mean()]
-        })
+            'mean_HInew': np.nanmean(HInew),
+            'median_HInew': hinew_med,
+            'HInew_range': hinew_max - hinew_min,
+            'mean_abs_HInew': np.nanmean(np.abs(HInew))
+        }
+
+    return scalars, HI_data, df_all
+
+
+def calculate_lawlerlloyd_metrics(df_obs, time_col='Etime', discharge_col='Q', concentration_col='C', resample=True, methods=('lloyd', 'lawler')):
+    """
+    Calculate Lawler-Lloyd hysteresis index.
 
+    Parameters
+    ----------
+    df_obs : pd.DataFrame
+        Observed data with time, discharge, and concentration columns
+    time_col, discharge_col, concentration_col : str
+        Column names for time, discharge, and concentration
+    resample : bool, default True
+        Resample to a regular hourly grid. Data already sampled exactly
+        hourly passes through unchanged; set False to skip resampling for
+        data prepared externally.
+    methods : tuple of str, default ('lloyd', 'lawler')
+        HI variants to compute. Drop 'lawler' to skip the ratio-based HIL
+        when only the recommended Lloyd HInew is needed; the HIL columns
+        are then NaN.
+
+    Returns
+    -------
+    metrics_df : pd.DataFrame
+        Lawler-Lloyd metrics:
+        - mean_HI: Mean hysteresis index across percentiles
+        - median_HI: Median hysteresis index
+        - HI_range: Range of HI values (max - min)
+        - mean_abs_HI: Mean of absolute HI values
+    df_all : pd.DataFrame
+        Processed time series data with:
+        - Q, C: Original discharge and concentration values
+        - QS, CS: Normalized (0-1) discharge and concentration
+        - Qphase, Cphase: Rising/falling phase indicators
+        - switchpoints: Peak markers (gQ, gC, lQ, lC)
+        Plus HI percentile data stored in attrs:
+        - attrs['HI_percentiles']: DataFrame with Hi, RLi, FLi at each QS percentile
+    """
+    scalars, HI_data, df_all = _lloyd_scalars(df_obs, time_col, discharge_col,
+                                              concentration_col, resample, methods)
+    metric_df = pd.DataFrame([scalars])
     # Store percentile data in attrs for plotting
     metric_df.attrs['HI_percentiles'] = HI_data
 
     return metric_df, df_all
 
 
+def _lloyd_batch_worker(df_obs, kwargs):
+    """Top-level worker so ProcessPoolExecutor can pickle the batch call."""
+    return _lloyd_scalars(df_obs, **kwargs)[0]
+
+
+def calculate_lawlerlloyd_metrics_batch(events, n_jobs=None, **kwargs):
+    """
+    Run calculate_lawlerlloyd_metrics over many storm events.
+
+    Parameters
+    ----------
+    events : sequence of pd.DataFrame
+        One observed-data frame per event, as accepted by
+        calculate_lawlerlloyd_metrics
+    n_jobs : int, optional
+        Number of worker processes; None or 1 runs serially, -1 uses all cores
+    **kwargs
+        Forwarded to calculate_lawlerlloyd_metrics (column names)
+
+    Returns
+    -------
+    pd.DataFrame
+        Stacked Lawler-Lloyd metrics, one row per event in input order. The
+        per-event HI percentile data (attrs) and processed frames are not
+        carried over; call calculate_lawlerlloyd_metrics directly for events
+        that need plotting.
+    """
+    events = list(events)
+    if not events:
+        return pd.DataFrame()
+
+    if n_jobs in (None, 1) or len(events) < 2:
+        rows = [_lloyd_scalars(ev, **kwargs)[0] for ev in events]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        from functools import partial
+        with ProcessPoolExecutor(max_workers=None if n_jobs == -1 else n_jobs) as pool:
+            rows = list(pool.map(partial(_lloyd_batch_worker, kwargs=kwargs), events))
+
+    return pd.DataFrame.from_records(rows)
+
+
 def lloyd_plot(df_all, metrics):
     """
     Visualize Lawler-Lloyd hysteresis analysis in a two-panel plot:
@@ -182,6 +263,7 @@ def lloyd_plot(df_all, metrics):
     metrics :: Metrics DataFrame from calculate_lawlerlloyd_metrics
     returns :: fig -> can be shown, saved, or further be processed
     """
+    import plotly.graph_objects as go
     from plotly.subplots import make_subplots
 
     # Extract Lloyd-specific data from attrs
@@ -21,11 +21,159 @@ and classifies hysteresis patterns into 9 classes.
 
 import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
-from scipy.signal import find_peaks
-from sklearn.preprocessing import MinMaxScaler
+from .harp import _build_limbs, _local_maxima
 
-def calculate_zuecco_metrics(df_obs, time_col='Etime', discharge_col='Q', concentration_col='C'):
+# Fixed label vocabularies for the switchpoint/phase Categorical columns
+_SWITCH_CATS = ('', 'lQ', 'lC', 'gQ', 'gC')
+_PHASE_CATS = ('rising', 'falling')
+
+# Default integration grid (0.15 to 1.0, from the original implementation)
+# and its precomputed trapezoid half-widths
+_XFIX_DEFAULT = np.linspace(0.15, 1.0, 18, dtype=np.float32)
+_HALF_DX_DEFAULT = 0.5 * np.diff(_XFIX_DEFAULT)
+
+def _zuecco_scalars(df_obs, time_col='Etime', discharge_col='Q', concentration_col='C', resample=True, x_fixed=None):
+    """
+    Core Zuecco computation.
+
+    Returns a plain dict of metric scalars plus the processed frame, so
+    batch callers can defer DataFrame construction to a single stacked
+    build; see calculate_zuecco_metrics for the metric descriptions.
+    """
+    # Validate input
+    if ((discharge_col not in df_obs.columns) | (concentration_col not in df_obs.columns) | (time_col not in df_obs.columns)):
+        raise ValueError(f"Columns '{discharge_col}' and/or '{concentration_col}' and/or '{time_col}' not found in dataframe")
+
+    # Check for NaN values
+    if df_obs[discharge_col].isna().any() or df_obs[concentration_col].isna().any():
+        df_obs = df_obs.dropna()
+        print('Input data contains NaN values. Rows dropped. Consider data preparation before processing.')
+
+    df_all = df_obs[[time_col, discharge_col, concentration_col]].copy()
+    df_all.columns = ['Etime', 'Q', 'C']  # Rename to standard names
+
+    # Prepare time index
+    if pd.api.types.is_numeric_dtype(df_obs[time_col]):
+        df_all.index = pd.to_timedelta(df_all['Etime'], unit='D')
+    else:
+        df_all.index = df_all['Etime'] - df_all['Etime'].iloc[0]
+
+    # Resample and interpolate; already-hourly data passes through unchanged.
+    # Trim leading/trailing all-NaN runs first: forward interpolation cannot
+    # fill them anyway, so there is no point scanning them.
+    dt = np.diff(df_all.index.total_seconds().to_numpy())
+    if resample and not (dt.size > 0 and (dt == 3600.0).all()):
+        df_all = df_all.resample('1h').first()
+        df_all = df_all.loc[df_all.first_valid_index():df_all.last_valid_index()]
+        df_all = df_all.interpolate(method='linear', limit=None, limit_direction='forward')
+
+    # Create numeric Etime from index for scaling
+    df_all['Etime'] = df_all.index.total_seconds() / 86400.0  # Convert to days
+
+    # Min-max scaling (constant columns scale to zero, like MinMaxScaler)
+    arr = df_all[['Etime', 'Q', 'C']].to_numpy()
+    mn = arr.min(axis=0)
+    rng = arr.max(axis=0) - mn
+    rng[rng == 0] = 1.0
+    scaled = (arr - mn) / rng
+    df_all['EtimeS'] = scaled[:, 0]
+    # The normalized loop coordinates only feed 18-point trapezoid sums on
+    # [0, 1] data; float32 is ample and halves the sort/interp bandwidth
+    df_all['QS'] = scaled[:, 1].astype(np.float32)
+    df_all['CS'] = scaled[:, 2].astype(np.float32)
+
+    # Cache the value arrays and peak positions; reused for the switchpoint
+    # and phase labels and again by the classifier below
+    q_arr = df_all['Q'].to_numpy()
+    c_arr = df_all['C'].to_numpy()
+    qmax_i = int(q_arr.argmax())
+    cmax_i = int(c_arr.argmax())
+
+    # Find peaks and mark switchpoints. Labels are filled positionally into a
+    # numpy array and stored as a Categorical column (int8 codes instead of
+    # object strings), which keeps the string API for callers.
+    n = len(df_all)
+    switch = np.full(n, '', dtype=object)
+    switch[_local_maxima(q_arr)] = 'lQ'
+    switch[_local_maxima(c_arr)] = 'lC'
+    switch[qmax_i] = 'gQ'
+    switch[cmax_i] = 'gC'
+    df_all['switchpoints'] = pd.Categorical(switch, categories=_SWITCH_CATS)
+
+    # Define phases based on discharge (peak row itself counts as falling)
+    rising = np.arange(n) < qmax_i
+    df_all['Qphase'] = pd.Categorical(
+        np.where(rising, 'rising', 'falling'), categories=_PHASE_CATS)
+    df_all['Cphase'] = pd.Categorical(
+        np.where(np.arange(n) < cmax_i, 'rising', 'falling'), categories=_PHASE_CATS)
+
+    # Create limbs (duplicates are averaged per QS value within each limb)
+    # Columns are integer indices: 0 = rising, 1 = falling
+    qs = df_all['QS'].to_numpy()
+    cs = df_all['CS'].to_numpy()
+    limbs = _build_limbs(qs, cs, rising, ~rising)
+
+    # Define x_fixed points for Zuecco integration; the default grid and
+    # its trapezoid half-widths are precomputed at import
+    if x_fixed is None:
+        xf = _XFIX_DEFAULT
+        half_dx = _HALF_DX_DEFAULT
+    else:
+        xf = np.asarray(x_fixed, dtype=np.float32)
+        half_dx = 0.5 * np.diff(xf)
+
+    # Sample limbs at x_fixed points with one linear-interpolation pass per
+    # limb; the two limbs are carried as plain arrays (column 0 = rising,
+    # 1 = falling in the stacked attrs payload)
+    qs_grid = limbs.index.to_numpy()
+
+    def _sample(y):
+        valid = ~np.isnan(y)
+        if valid.any():
+            return np.interp(xf, qs_grid[valid], y[valid]).astype(np.float32)
+        return np.full(len(xf), np.nan, dtype=np.float32)
+
+    rise = _sample(limbs[0].to_numpy())
+    fall = _sample(limbs[1].to_numpy())
+    limbs_fixed = np.stack([rise, fall], axis=1)
+
+    # Calculate differential areas between rising and falling limbs
+    # Area of each trapezoid: (y1 + y2) * dx / 2
+    diff_area = half_dx * ((rise[1:] + rise[:-1]) - (fall[1:] + fall[:-1]))
+
+    # Hysteresis index: sum of differential areas (back to full precision
+    # for downstream consumers)
+    h_index = float(diff_area.sum())
+    h_index = h_index if np.isfinite(h_index) else 0
+
+    # Get min/max for classification
+    min_diff_area = float(diff_area.min()) if len(diff_area) > 0 else np.nan
+    max_diff_area = float(diff_area.max()) if len(diff_area) > 0 else np.nan
+
+    # Classify hysteresis pattern (use renamed columns)
+    hyst_class = _find_hysteresis_class(
+        q_arr, c_arr,
+        min_diff_area, max_diff_area, h_index,
+        pos_max_x=qmax_i
+    )
+
+    # Store results
+    scalars = {
+        'h_index': h_index,
+        'hyst_class': hyst_class,
+        'min_diff_area': min_diff_area,
+        'max_diff_area': max_diff_area,
+    }
+
+    # Store limbs_fixed data in attrs for plotting
+    df_all.attrs['limbs_fixed'] = limbs_fixed
+    df_all.attrs['diff_area'] = diff_area
+    df_all.attrs['x_fixed'] = xf
+
+    return scalars, df_all
+
+
+def calculate_zuecco_metrics(df_obs, time_col='Etime', discharge_col='Q', concentration_col='C', resample=True, x_fixed=None):
     """
     Calculate Zuecco hysteresis index and classification.
 
@@ -35,7 +183,14 @@ def calculate_zuecco_metrics(df_obs, time_col='Etime', discharge_col='Q', concen
         Observed data with time, discharge, and concentration columns
     time_col, discharge_col, concentration_col : str
         Column names for time, discharge, and concentration
-    
+    resample : bool, default True
+        Resample to a regular hourly grid. Data already sampled exactly
+        hourly passes through unchanged; set False to skip resampling for
+        data prepared externally.
+    x_fixed : array-like, optional
+        QS values at which the limbs are integrated; defaults to the
+        original 18-point grid from 0.15 to 1.0.
+
     Returns
     -------
     metrics_df : pd.DataFrame
@@ -53,120 +208,197 @@ def calculate_zuecco_metrics(df_obs, time_col='Etime', discharge_col='Q', concen
         Plus x_fixed interpolation stored in attrs:
         - attrs['x_fixed_interp']: DataFrame with x_fixed, y_rise, y_fall, diff_area
     """
-    # Validate input
-    if ((discharge_col not in df_obs.columns) | (concentration_col not in df_obs.columns) | (time_col not in df_obs.columns)):
-        raise ValueError(f"Columns '{discharge_col}' and/or '{concentration_col}' and/or '{time_col}' not found in dataframe")
+    scalars, df_all = _zuecco_scalars(df_obs, time_col, discharge_col,
+                                      concentration_col, resample, x_fixed)
+    return pd.DataFrame([scalars]), df_all
 
-    # Check for NaN values
-    if df_obs[discharge_col].isna().any() or df_obs[concentration_col].isna().any():
-        df_obs = df_obs.dropna()
-        print('Input data contains NaN values. Rows dropped. Consider data preparation before processing.')
 
-    df_all = df_obs[[time_col, discharge_col, concentration_col]].copy()
-    df_all.columns = ['Etime', 'Q', 'C']  # Rename to standard names
+def _zuecco_batch_worker(df_obs, kwargs):
+    """Top-level worker so ProcessPoolExecutor can pickle the batch call."""
+    return _zuecco_scalars(df_obs, **kwargs)[0]
 
-    # Prepare time index
-    if pd.api.types.is_numeric_dtype(df_obs[time_col]):
-        df_all.index = pd.to_timedelta(df_all['Etime'], unit='D')
+
+def calculate_zuecco_metrics_batch(events, n_jobs=None, **kwargs):
+    """
+    Run calculate_zuecco_metrics over many storm events.
+
+    Parameters
+    ----------
+    events : sequence of pd.DataFrame
+        One observed-data frame per event, as accepted by
+        calculate_zuecco_metrics
+    n_jobs : int, optional
+        Number of worker processes; None or 1 runs serially, -1 uses all cores
+    **kwargs
+        Forwarded to calculate_zuecco_metrics (column names, grid)
+
+    Returns
+    -------
+    pd.DataFrame
+        Stacked Zuecco metrics, one row per event in input order. The
+        per-event limb data (attrs) and processed frames are not carried
+        over; call calculate_zuecco_metrics directly for events that need
+        plotting.
+    """
+    events = list(events)
+    if not events:
+        return pd.DataFrame()
+
+    if n_jobs in (None, 1) or len(events) < 2:
+        rows = [_zuecco_scalars(ev, **kwargs)[0] for ev in events]
     else:
-        df_all.index = df_all['Etime'] - df_all['Etime'].iloc[0]
+        from concurrent.futures import ProcessPoolExecutor
+        from functools import partial
+        with ProcessPoolExecutor(max_workers=None if n_jobs == -1 else n_jobs) as pool:
+            rows = list(pool.map(partial(_zuecco_batch_worker, kwargs=kwargs), events))
 
-    # Resample and interpolate
-    df_all = df_all.resample('1h').first().interpolate(method='linear', limit=None, limit_direction='forward')
+    return pd.DataFrame.from_records(rows)
 
-    # Create numeric Etime from index for scaling
-    df_all['Etime'] = df_all.index.total_seconds() / 86400.0  # Convert to days
 
-    # Min-max scaling
-    df_all[['EtimeS', 'QS', 'CS']] = MinMaxScaler().fit_transform(df_all[['Etime', 'Q', 'C']])
+def calculate_zuecco_metrics_multi(df_obs, time_col='Etime', discharge_col='Q', concentration_cols=None, resample=True, x_fixed=None):
+    """
+    Calculate Zuecco metrics for several solutes against one discharge series.
 
-    # Find peaks and mark switchpoints
-    df_all['switchpoints'] = ''
-    df_all.loc[df_all.index[find_peaks(df_all['Q'])[0]], 'switchpoints'] = 'lQ'
-    df_all.loc[df_all.index[find_peaks(df_all['C'])[0]], 'switchpoints'] = 'lC'
-    df_all.loc[df_all.index[df_all['Q'].argmax()], 'switchpoints'] = 'gQ'
-    df_all.loc[df_all.index[df_all['C'].argmax()], 'switchpoints'] = 'gC'
+    The discharge side of the computation (resampling, scaling, peak
+    position, phase split and the QS sort) is done once and shared by all
+    solutes; only the per-solute limb averaging, grid sampling and
+    classification run per column. For K solutes this replaces K full
+    calculate_zuecco_metrics calls.
 
-    # Define phases based on discharge
-    df_all['Qphase'] = 'rising'
-    df_all.loc[df_all.index[df_all['Q'].argmax()]:, 'Qphase'] = 'falling'
+    Parameters
+    ----------
+    df_obs : pd.DataFrame
+        Observed data with time, discharge, and concentration columns
+    time_col, discharge_col : str
+        Column names for time and discharge
+    concentration_cols : list of str
+        Concentration columns to evaluate, one metrics row each
+    resample : bool, default True
+        Resample to a regular hourly grid. Data already sampled exactly
+        hourly passes through unchanged; set False to skip resampling for
+        data prepared externally.
+    x_fixed : array-like, optional
+        QS values at which the limbs are integrated; defaults to the
+        original 18-point grid from 0.15 to 1.0.
 
-    df_all['Cphase'] = 'rising'
-    df_all.loc[df_all.index[df_all['C'].argmax()]:, 'Cphase'] = 'falling'
+    Returns
+    -------
+    pd.DataFrame
+        One row per concentration column, in input order, with a leading
+        'solute' column plus h_index, hyst_class, min_diff_area and
+        max_diff_area as in calculate_zuecco_metrics. The processed frame
+        and limb attrs are not carried over; call calculate_zuecco_metrics
+        directly for solutes that need plotting.
+    """
+    # Validate input
+    if not concentration_cols:
+        raise ValueError("concentration_cols must name at least one column")
+    missing = [c for c in [time_col, discharge_col, *concentration_cols] if c not in df_obs.columns]
+    if missing:
+        raise ValueError(f"Columns {missing} not found in dataframe")
 
-    # Create limbs using original elegant pandas approach
-    # Handle duplicates by taking mean of CS values at same QS
-    rising_limb = df_all.loc[df_all.Qphase == 'rising', ['QS', 'CS']].groupby('QS').mean()['CS']
-    falling_limb = df_all.loc[df_all.Qphase == 'falling', ['QS', 'CS']].groupby('QS').mean()['CS']
+    # Check for NaN values
+    if df_obs[[discharge_col, *concentration_cols]].isna().any().any():
+        df_obs = df_obs.dropna()
+        print('Input data contains NaN values. Rows dropped. Consider data preparation before processing.')
 
-    limbs = pd.concat([rising_limb, falling_limb], axis=1, sort=True).interpolate(method='linear')
-    limbs.columns = [0, 1]  # Use integer column names for compatibility
+    df_all = df_obs[[time_col, discharge_col, *concentration_cols]].copy()
 
-    # Define x_fixed points for Zuecco integration (default from original: 0.15 to 1.0)
-    x_fixed = pd.Series(np.linspace(0.15, 1.0, 18))
+    # Prepare time index
+    if pd.api.types.is_numeric_dtype(df_obs[time_col]):
+        df_all.index = pd.to_timedelta(df_all[time_col], unit='D')
+    else:
+        df_all.index = df_all[time_col] - df_all[time_col].iloc[0]
+
+    # Resample and interpolate; already-hourly data passes through unchanged.
+    # Trim leading/trailing all-NaN runs first: forward interpolation cannot
+    # fill them anyway, so there is no point scanning them.
+    dt = np.diff(df_all.index.total_seconds().to_numpy())
+    if resample and not (dt.size > 0 and (dt == 3600.0).all()):
+        df_all = df_all.resample('1h').first()
+        df_all = df_all.loc[df_all.first_valid_index():df_all.last_valid_index()]
+        df_all = df_all.interpolate(method='linear', limit=None, limit_direction='forward')
+
+    # Min-max scaling per column (constant columns scale to zero); the
+    # solutes are kept together as one (N, K) float32 matrix
+    arr = df_all[[discharge_col, *concentration_cols]].to_numpy()
+    mn = arr.min(axis=0)
+    rng = arr.max(axis=0) - mn
+    rng[rng == 0] = 1.0
+    scaled = ((arr - mn) / rng).astype(np.float32)
+    qs = scaled[:, 0]
+    C = scaled[:, 1:]
+
+    # Discharge-side quantities, computed once for all solutes
+    q_arr = df_all[discharge_col].to_numpy()
+    qmax_i = int(q_arr.argmax())
+    n = len(df_all)
+    rising = np.arange(n) < qmax_i
+
+    # One shared sort by QS; _build_limbs sees monotone input and skips
+    # its own argsort on every per-solute call
+    order = np.argsort(qs, kind='stable')
+    qs_s = qs[order]
+    rise_s = rising[order]
+    fall_s = ~rising[order]
+
+    # x_fixed grid as in the single-solute path
+    if x_fixed is None:
+        xf = _XFIX_DEFAULT
+        half_dx = _HALF_DX_DEFAULT
+    else:
+        xf = np.asarray(x_fixed, dtype=np.float32)
+        half_dx = 0.5 * np.diff(xf)
 
-    # Sample limbs at x_fixed points - limbs are already indexed by QS and interpolated
-    limbs_fixed = limbs.reindex(x_fixed, method='nearest', tolerance=0.01, limit=1)
-    limbs_fixed = limbs_fixed.interpolate(method='linear')
-    limbs_fixed.columns = [0, 1]  # Ensure integer column names
+    rows = []
+    for j, col in enumerate(concentration_cols):
+        limbs = _build_limbs(qs_s, C[order, j], rise_s, fall_s)
 
-    # Check if we have valid data at fixed points
-    if limbs_fixed.isna().all().any():
-        print("Warning: Some x_fixed points could not be interpolated. Using fallback method.")
-        # Fallback: use simple interpolation across full range
-        limbs_fixed = pd.DataFrame({
-            0: np.interp(x_fixed, limbs.index, limbs[0]),
-            1: np.interp(x_fixed, limbs.index, limbs[1])
-        }, index=x_fixed)
+        qs_grid = limbs.index.to_numpy()
 
-    # Calculate differential areas between rising and falling limbs
-    # Area of each trapezoid: (y1 + y2) * dx / 2
-    diff_area = pd.Series(index=range(len(x_fixed) - 1), dtype=float)
-    for j in range(len(x_fixed) - 1):
-        dx = x_fixed.iloc[j + 1] - x_fixed.iloc[j]
-        rise_trap = (limbs_fixed.iloc[j + 1, 0] + limbs_fixed.iloc[j, 0]) * dx / 2
-        fall_trap = (limbs_fixed.iloc[j + 1, 1] + limbs_fixed.iloc[j, 1]) * dx / 2
-        diff_area.iloc[j] = rise_trap - fall_trap
-
-    # Hysteresis index: sum of differential areas
-    h_index = diff_area.sum()
-    h_index = h_index if np.isfinite(h_index) else 0
+        def _sample(y):
+            valid = ~np.isnan(y)
+            if valid.any():
+                return np.interp(xf, qs_grid[valid], y[valid]).astype(np.float32)
+            return np.full(len(xf), np.nan, dtype=np.float32)
 
-    # Get min/max for classification
-    min_diff_area = diff_area.min() if len(diff_area) > 0 else np.nan
-    max_diff_area = diff_area.max() if len(diff_area) > 0 else np.nan
+        rise = _sample(limbs[0].to_numpy())
+        fall = _sample(limbs[1].to_numpy())
 
-    # Classify hysteresis pattern (use renamed columns)
-    hyst_class = _find_hysteresis_class(
-        df_all['Q'], df_all['C'],
-        min_diff_area, max_diff_area, h_index
-    )
+        diff_area = half_dx * ((rise[1:] + rise[:-1]) - (fall[1:] + fall[:-1]))
+        h_index = float(diff_area.sum())
+        h_index = h_index if np.isfinite(h_index) else 0
+        min_diff_area = float(diff_area.min()) if len(diff_area) > 0 else np.nan
+        max_diff_area = float(diff_area.max()) if len(diff_area) > 0 else np.nan
 
-    # Store results
-    metric_df = pd.DataFrame({
-        'h_index': [h_index],
-        'hyst_class': [hyst_class],
-        'min_diff_area': [min_diff_area],
-        'max_diff_area': [max_diff_area]
-    })
+        hyst_class = _find_hysteresis_class(
+            q_arr, df_all[col].to_numpy(),
+            min_diff_area, max_diff_area, h_index,
+            pos_max_x=qmax_i
+        )
 
-    # Store limbs_fixed data in attrs for plotting
-    df_all.attrs['limbs_fixed'] = limbs_fixed
-    df_all.attrs['diff_area'] = diff_area
-    df_all.attrs['x_fixed'] = x_fixed
+        rows.append({
+            'solute': col,
+            'h_index': h_index,
+            'hyst_class': hyst_class,
+            'min_diff_area': min_diff_area,
+            'max_diff_area': max_diff_area,
+        })
 
-    return metric_df, df_all
+    return pd.DataFrame.from_records(rows)
 
 
 def _find_hysteresis_class(
-    x: pd.Series,
-    y: pd.Series,
+    x: np.ndarray,
+    y: np.ndarray,
     min_diff_area: float,
     max_diff_area: float,
-    h_index: float
+    h_index: float,
+    pos_max_x: int = None
 ) -> int:
     """
     Classify hysteresis pattern into one of 9 classes (0-8).
+    pos_max_x can pass a precomputed argmax of x to skip the scan here.
 
     Classes based on Zuecco et al. (2016):
     0: Linear (no hysteresis)
@@ -178,13 +410,16 @@ def _find_hysteresis_class(
     hyst_class : int
         Hysteresis class (0-8)
     """
-    pos_max_x = x.index.get_loc(x.idxmax())
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if pos_max_x is None:
+        pos_max_x = int(x.argmax())
 
     # Check rising limb
-    min_y_rise = y.iloc[:pos_max_x + 1].min()
-    max_y_rise = y.iloc[:pos_max_x + 1].max()
-    change_max_y_rise = abs(max_y_rise - y.iloc[0])
-    change_min_y_rise = abs(min_y_rise - y.iloc[0])
+    min_y_rise = y[:pos_max_x + 1].min()
+    max_y_rise = y[:pos_max_x + 1].max()
+    change_max_y_rise = abs(max_y_rise - y[0])
+    change_min_y_rise = abs(min_y_rise - y[0])
 
     if change_max_y_rise != change_min_y_rise:
         hyst_class = _determine_class(
@@ -193,10 +428,10 @@ def _find_hysteresis_class(
         )
     else:
         # Check falling limb
-        min_y_fall = y.iloc[pos_max_x:].min()
-        max_y_fall = y.iloc[pos_max_x:].max()
-        change_max_y_fall = abs(max_y_fall - y.iloc[0])
-        change_min_y_fall = abs(min_y_fall - y.iloc[0])
+        min_y_fall = y[pos_max_x:].min()
+        max_y_fall = y[pos_max_x:].max()
+        change_max_y_fall = abs(max_y_fall - y[0])
+        change_min_y_fall = abs(min_y_fall - y[0])
 
         if change_min_y_fall != change_max_y_fall:
             hyst_class = _determine_class(
@@ -258,6 +493,7 @@ def zuecco_plot(df_all, metrics):
     metrics :: Metrics DataFrame from calculate_zuecco_metrics
     returns :: fig -> can be shown, saved, or further be processed
     """
+    import plotly.graph_objects as go
     from plotly.subplots import make_subplots
 
     # Extract Zuecco-specific data from attrs
@@ -277,16 +513,19 @@ def zuecco_plot(df_all, metrics):
     # Left plot: Hysteresis loop
     fig.add_trace(go.Scatter(x=df_all['QS'],y=df_all['CS'],mode='lines+markers',marker=dict(size=4, color='steelblue'),line=dict(color='steelblue'),name='Data'),row=1, col=1)
 
-    # Add rising limb (limbs_fixed[0])
-    fig.add_trace(go.Scatter(x=x_fixed,y=limbs_fixed[0],mode='lines+markers',marker=dict(size=6, symbol='circle', color='green'),line=dict(color='green', dash='dot'),name='Rising limb'),row=1, col=1)
+    # np.asarray also accepts the DataFrame payload of older result frames
+    lf = np.asarray(limbs_fixed)
+
+    # Add rising limb (column 0)
+    fig.add_trace(go.Scatter(x=x_fixed,y=lf[:, 0],mode='lines+markers',marker=dict(size=6, symbol='circle', color='green'),line=dict(color='green', dash='dot'),name='Rising limb'),row=1, col=1)
 
-    # Add falling limb (limbs_fixed[1])
-    fig.add_trace(go.Scatter(x=x_fixed,y=limbs_fixed[1],mode='lines+markers',marker=dict(size=6, symbol='square', color='red'),line=dict(color='red', dash='dot'),name='Falling limb'),row=1, col=1)
+    # Add falling limb (column 1)
+    fig.add_trace(go.Scatter(x=x_fixed,y=lf[:, 1],mode='lines+markers',marker=dict(size=6, symbol='square', color='red'),line=dict(color='red', dash='dot'),name='Falling limb'),row=1, col=1)
 
     # Right plot: Differential area
     x_fixed_plot = x_fixed[:len(diff_area)]
 
-    fig.add_trace(go.Scatter(x=x_fixed_plot,y=diff_area.values,mode='lines+markers',marker=dict(size=6, color='red'),line=dict(color='red'),name='ΔA',fill='tozeroy',fillcolor='rgba(255,0,0,0.1)'),row=1, col=2)
+    fig.add_trace(go.Scatter(x=x_fixed_plot,y=np.asarray(diff_area),mode='lines+markers',marker=dict(size=6, color='red'),line=dict(color='red'),name='ΔA',fill='tozeroy',fillcolor='rgba(255,0,0,0.1)'),row=1, col=2)
 
     # Add zero line
     fig.add_hline(y=0, line_dash="solid", line_color="black", line_width=1,row=1, col=2)
@@ -29,9 +29,7 @@ setup(
     install_requires=[
         "pandas>=1.3.0",
         "numpy>=1.20.0",
-        "scipy>=1.7.0",
         "plotly>=5.0.0",
-        "scikit-learn>=0.24.0",
     ],
     extras_require={
         "dev": [